@@ -1,25 +1,133 @@
 import os
 import json
-import io
-import base64
+import math
+import threading
+import time
 
-import matplotlib
-# Use a non-GUI backend to avoid "Starting a Matplotlib GUI outside the main thread" warnings
-matplotlib.use('Agg')
+from flask import Flask, Response, abort, g, request, render_template, stream_with_context
+from markupsafe import escape
 
-import matplotlib.pyplot as plt
-from flask import Flask, request, render_template
-
-from optimization.ilp_solver import optimize_nutrition
+import charts
+from optimization.alternatives import alternative_plans
+from optimization.backends import get_backend
+from optimization.cache import ResultCache, canonical_constraints
+from optimization.ilp_solver import MODES, extract_solution, optimize_batch, optimize_nutrition
+from optimization.jobs import JobManager, JobQueueFull
+from optimization.metrics import PHASE_SECONDS, REGISTRY, REQUEST_SECONDS, cache_collector
+from optimization.model import parse_constraints
+from optimization.presets import DEFAULT_WEIGHTS, PresetTable
+from optimization.presolve import presolve_cache
+from optimization.sessions import SessionManager
+from optimization.store import CatalogStore
+from optimization.sweep import sweep_nutrition
+from optimization.weekly import compare_week_plans, plan_week
 
 app = Flask(__name__)
 
-# Load foods data at startup
 DATA_DIR = os.path.join(os.path.dirname(__file__), "data")
 FOODS_FILE = os.path.join(DATA_DIR, "foods.json")
 
-with open(FOODS_FILE, 'r') as f:
-    foods_data = json.load(f)
+# Solver backend ('cbc' by default, or 'highs' in-process); see optimization/backends.py
+solver_backend = get_backend(os.environ.get('NUTRITION_SOLVER'))
+
+# Process pool size for /optimize/batch (None = one worker per CPU); also
+# the most workers a request may ask for
+BATCH_WORKERS = int(os.environ['BATCH_WORKERS']) if os.environ.get('BATCH_WORKERS') else None
+BATCH_MAX_WORKERS = BATCH_WORKERS or os.cpu_count() or 1
+# Batch requests streaming at once; each runs its own process pool, so
+# further requests get a 503 instead of forking more pools
+BATCH_CONCURRENCY = int(os.environ.get('BATCH_CONCURRENCY', 2))
+batch_slots = threading.BoundedSemaphore(BATCH_CONCURRENCY)
+
+# Threads per /sweep request (each solves one contiguous segment of the
+# range); also the most a request may ask for
+SWEEP_WORKERS = int(os.environ.get('SWEEP_WORKERS', os.cpu_count() or 1))
+
+# Upper bound on ?time_limit= for synchronous solves (seconds)
+SOLVE_MAX_TIME_LIMIT = float(os.environ.get('SOLVE_MAX_TIME_LIMIT', 30))
+
+# Cache of solved /optimize results, keyed on the canonical constraint set
+result_cache = ResultCache(
+    maxsize=int(os.environ.get('RESULT_CACHE_SIZE', 256)),
+    ttl=float(os.environ.get('RESULT_CACHE_TTL', 600)),
+)
+
+# Rendered chart images, keyed on (chart token, format). Charts are only
+# rendered when /chart/<token> is requested; the token carries the chart
+# data, so any worker can render it.
+chart_cache = ResultCache(maxsize=int(os.environ.get('CHART_CACHE_SIZE', 256)), ttl=None)
+
+# Compiled, memory-mapped catalog of foods.json (hot-swapped when the file
+# changes); see optimization/store.py
+catalog_store = CatalogStore(
+    FOODS_FILE,
+    cache_dir=os.environ.get('CATALOG_CACHE_DIR', os.path.join(DATA_DIR, '.catalog_cache')),
+)
+# Results solved against the old catalog can never be served again
+catalog_store.subscribe(lambda catalog: result_cache.clear())
+
+# Exact solutions of the form's body-weight presets, rebuilt in the
+# background on every catalog load (PRESET_TABLE=0 disables it); see
+# optimization/presets.py
+preset_table = PresetTable(
+    weights=DEFAULT_WEIGHTS if os.environ.get('PRESET_TABLE', '1') != '0' else (),
+    backend=solver_backend,
+    max_workers=BATCH_WORKERS,
+)
+catalog_store.subscribe(preset_table.rebuild_async)
+
+
+def current_catalog():
+    """
+    Return the current catalog, reloading it if foods.json changed on disk.
+    """
+    return catalog_store.current()
+
+
+current_catalog()
+
+# Background solve jobs (/jobs): bounded pool + queue, separate from request threads
+job_manager = JobManager(
+    current_catalog,
+    backend=solver_backend,
+    max_workers=int(os.environ.get('JOB_WORKERS', 2)),
+    max_queue=int(os.environ.get('JOB_QUEUE_SIZE', 32)),
+    max_time_limit=float(os.environ.get('JOB_MAX_TIME_LIMIT', 120)),
+)
+
+# Per-user in-memory models for interactive re-solves (/sessions)
+session_manager = SessionManager(
+    backend=solver_backend,
+    max_sessions=int(os.environ.get('SESSION_MAX', 64)),
+    idle_timeout=float(os.environ.get('SESSION_IDLE_TIMEOUT', 900)),
+)
+
+# Cache counters are read from the caches themselves when /metrics is scraped
+REGISTRY.add_collector(cache_collector({
+    'results': result_cache,
+    'charts': chart_cache,
+    'presolve': presolve_cache,
+    'presets': preset_table,
+}))
+
+
+@app.before_request
+def start_timer():
+    g.request_start = time.perf_counter()
+
+
+@app.after_request
+def record_latency(response):
+    # Streaming responses (NDJSON, SSE) are timed until their first byte
+    start = g.pop('request_start', None)
+    if start is not None:
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            endpoint=request.endpoint or 'unknown',
+            method=request.method,
+        )
+    return response
+
 
 @app.route('/')
 def index():
@@ -28,81 +136,489 @@ def index():
     """
     return render_template('index.html')
 
+def read_constraints():
+    """
+    Constraints posted by main.js as JSON (an empty body means no constraints).
+    Raises ValueError unless they are an object of numeric (or empty) values.
+    """
+    with PHASE_SECONDS.time(phase='parse'):
+        constraints = request.get_json(silent=True)
+    if constraints is None:
+        constraints = {}
+    if not isinstance(constraints, dict):
+        raise ValueError("Expected a JSON object of constraints")
+    parse_constraints(constraints)
+    return constraints
+
+
+def read_solve_options():
+    """
+    Solve options from the query string:
+        ?mode=exact|approximate&time_limit=<seconds>&gap=<relative gap>
+    time_limit and gap only apply to exact solves. Raises ValueError.
+    """
+    mode = request.args.get('mode') or 'exact'
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; choose from {', '.join(MODES)}")
+    time_limit = float(request.args['time_limit']) if request.args.get('time_limit') else None
+    gap = float(request.args['gap']) if request.args.get('gap') else None
+    if time_limit is not None and not 0 < time_limit <= SOLVE_MAX_TIME_LIMIT:
+        raise ValueError(f"time_limit must be in (0, {SOLVE_MAX_TIME_LIMIT}]")
+    if gap is not None and not 0 <= gap < 1:
+        raise ValueError("gap must be in [0, 1)")
+    if mode != 'exact':
+        time_limit = gap = None
+    return {'mode': mode, 'time_limit': time_limit, 'gap': gap}
+
+
+def read_body():
+    """
+    JSON object body of /sweep, /alternatives and /plan/week as
+    (payload, constraints, time_limit): "constraints" must be an object of
+    numeric values, and "time_limit" (seconds) defaults to (and is capped
+    by) SOLVE_MAX_TIME_LIMIT. Raises ValueError.
+    """
+    payload = request.get_json(silent=True)
+    if payload is None:
+        payload = {}
+    if not isinstance(payload, dict):
+        raise ValueError("Expected a JSON object")
+    constraints = payload.get('constraints') or {}
+    if not isinstance(constraints, dict):
+        raise ValueError("Expected 'constraints' to be an object")
+    parse_constraints(constraints)
+    try:
+        time_limit = float(payload.get('time_limit') or SOLVE_MAX_TIME_LIMIT)
+    except (TypeError, ValueError, OverflowError):
+        time_limit = math.nan
+    if not 0 < time_limit <= SOLVE_MAX_TIME_LIMIT:
+        raise ValueError(f"time_limit must be in (0, {SOLVE_MAX_TIME_LIMIT}]")
+    return payload, constraints, time_limit
+
+
+def read_workers(value, limit):
+    """
+    Pool size asked for by a client, clamped to [1, limit]; `limit` when
+    not given. Raises ValueError on a non-integer value.
+    """
+    if value is None:
+        return limit
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise ValueError("workers must be an integer")
+    try:
+        workers = int(value)
+    except ValueError:
+        raise ValueError("workers must be an integer") from None
+    return max(1, min(workers, limit))
+
+
+def solve_cached(constraints, solve=None, options=None):
+    """
+    Solve `constraints` (or fetch them from the result cache). Returns the
+    cache entry: {'solution', 'chart_token', 'html'}, where 'html' is filled
+    in lazily by the /optimize route.
+
+    `options` are read_solve_options() (default: exact, no limits).
+    `solve(constraints, catalog) -> solution` replaces the default cold
+    optimize_nutrition call on a cache miss. Constraint sets in the preset
+    table are never solved: its proven optimum answers every mode.
+    """
+    options = options or {'mode': 'exact', 'time_limit': None, 'gap': None}
+    catalog = current_catalog()
+    # Catalog version is part of the key so a result solved against an old
+    # catalog can never be served after a reload
+    key = (catalog.version, canonical_constraints(constraints), tuple(sorted(options.items())))
+    entry = result_cache.get(key)
+    if entry is not None:
+        return entry
+
+    solution = preset_table.get(catalog, constraints)
+    if solution is None and solve is None:
+        solution = optimize_nutrition(constraints, catalog, backend=solver_backend, **options)
+    elif solution is None:
+        solution = solve(constraints, catalog)
+
+    chart_token = None
+    if solution['status'] in ('Optimal', 'Feasible'):
+        chart_token = charts.encode_chart(charts.macro_breakdown(solution, catalog))
+        solution['totals'] = catalog.totals(solution['quantities'])
+
+    entry = {'solution': solution, 'chart_token': chart_token, 'html': None}
+    result_cache.put(key, entry)
+    return entry
+
+
 @app.route('/optimize', methods=['POST'])
 def optimize():
     """
-    1. Read JSON constraints from request (since front-end is using fetch + JSON or form data).
-       (We'll check how main.js sends data—here we assume JSON or you can adapt for form data.)
-    2. Solve ILP using 'optimize_nutrition'.
-    3. Generate a chart in memory with Matplotlib.
-    4. Return an HTML snippet that includes the base64-encoded chart <img>.
+    1. Read JSON constraints from request.
+    2. Solve ILP using 'optimize_nutrition' (or serve it from the result cache).
+    3. Return an HTML snippet; the chart is an <img> pointing at /chart/<token>.png,
+       rendered only when the browser asks for it.
+    Accepts the read_solve_options() query parameters.
     """
+    try:
+        options = read_solve_options()
+        constraints = read_constraints()
+    except ValueError as exc:
+        return f"<p>Invalid request: {escape(str(exc))}</p>", 400
+    entry = solve_cached(constraints, options=options)
+    if entry['html'] is None:
+        with PHASE_SECONDS.time(phase='render'):
+            entry['html'] = render_solution(entry['solution'], entry['chart_token'])
+    return entry['html']
+
+
+@app.route('/api/optimize', methods=['POST'])
+def optimize_api():
+    """
+    JSON version of /optimize:
+        {"status", "mode", "objective_value", "quantities", "totals",
+         "chart": {"png": "/chart/<token>.png", "svg": "/chart/<token>.svg"}}
+    plus "gap" / "lp_bound" where they apply (see optimize_nutrition), and
+    "preset": true when the answer came from the precomputed preset table.
+    ?mode=approximate answers live previews in about a millisecond.
+    """
+    try:
+        options = read_solve_options()
+        constraints = read_constraints()
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    return solution_json(solve_cached(constraints, options=options))
+
+
+def solution_json(entry):
+    result = dict(entry['solution'])
+    token = entry['chart_token']
+    result['chart'] = {fmt: f"/chart/{token}.{fmt}" for fmt in charts.RENDERERS} if token else None
+    return result
+
+
+@app.route('/sweep', methods=['POST'])
+def sweep():
+    """
+    Cost frontier over one constraint. Body:
+        {"constraints": {...}, "parameter": "min_protein",
+         "start": 50, "stop": 250, "step": 5, "workers": <optional>, "time_limit": <seconds>}
+    workers is capped at SWEEP_WORKERS. time_limit bounds the whole sweep
+    and defaults to (and is capped by) SOLVE_MAX_TIME_LIMIT.
+    Returns {"parameter", "points": [{value, status, objective_value, quantities, totals}],
+             "frontier": [[value, cost], ...], "timed_out"}.
+    """
+    try:
+        payload, constraints, time_limit = read_body()
+        return sweep_nutrition(
+            constraints,
+            current_catalog(),
+            payload.get('parameter'),
+            float(payload['start']),
+            float(payload['stop']),
+            float(payload['step']),
+            workers=read_workers(payload.get('workers'), SWEEP_WORKERS),
+            backend=solver_backend,
+            time_limit=time_limit,
+        )
+    except (KeyError, TypeError, ValueError, OverflowError) as exc:
+        return {"error": f"Invalid sweep: {exc}"}, 400
+
+
+@app.route('/alternatives', methods=['POST'])
+def alternatives():
+    """
+    The cheapest plan and up to k - 1 alternatives within a cost tolerance
+    of it, each with a different set of foods, solved from one model. Body:
+        {"constraints": {...}, "k": 5, "tolerance": 0.1, "time_limit": <seconds>}
+    time_limit bounds the whole enumeration and defaults to (and is capped
+    by) SOLVE_MAX_TIME_LIMIT.
+    Returns {"status", "optimum", "tolerance", "plans": [{rank, status,
+             objective_value, over_optimum, quantities, totals}], "solves",
+             "timed_out", "time"}.
+    """
+    try:
+        payload, constraints, time_limit = read_body()
+        return alternative_plans(
+            constraints,
+            current_catalog(),
+            k=int(payload.get('k', 5)),
+            tolerance=float(payload.get('tolerance', 0.1)),
+            backend=solver_backend,
+            time_limit=time_limit,
+        )
+    except (TypeError, ValueError, OverflowError) as exc:
+        return {"error": f"Invalid request: {exc}"}, 400
+
+
+@app.route('/plan/week', methods=['POST'])
+def plan_week_route():
+    """
+    Multi-day plan with variety constraints (see optimization/weekly.py). Body:
+        {"constraints": {...}, "days": 7, "max_servings": <optional>,
+         "no_consecutive": true, "method": "decomposed" | "monolithic",
+         "window": 2, "time_limit": <seconds>, "compare": false}
+    time_limit bounds the whole request (both methods together with
+    "compare") and defaults to (and is capped by) SOLVE_MAX_TIME_LIMIT.
+    Returns {"status", "method", "objective_value", "lower_bound", "gap",
+             "days": [{day, quantities, objective_value, totals}], "time", "solves"},
+    or with "compare": true {"decomposed": {...}, "monolithic": {...}, "cost_gap"}.
+    """
+    try:
+        payload, constraints, time_limit = read_body()
+        options = {
+            'days': int(payload.get('days', 7)),
+            'max_servings': int(payload['max_servings']) if payload.get('max_servings') is not None else None,
+            'no_consecutive': bool(payload.get('no_consecutive', True)),
+            'window': int(payload.get('window', 2)),
+            'backend': solver_backend,
+            'time_limit': time_limit,
+        }
+        if payload.get('compare'):
+            return compare_week_plans(constraints, current_catalog(), **options)
+        return plan_week(constraints, current_catalog(), method=payload.get('method') or 'decomposed', **options)
+    except (TypeError, ValueError, OverflowError) as exc:
+        return {"error": f"Invalid request: {exc}"}, 400
 
-    # If main.js sends JSON, do:
-    # constraints = request.get_json()
-    # If main.js sends form data, do something else. 
-    # For now, let's assume JSON:
-    constraints = request.get_json()
-    if constraints is None:
-        constraints = {}
 
-    solution = optimize_nutrition(constraints, foods_data)
+@app.route('/sessions', methods=['POST'])
+def create_session():
+    """
+    Open an interactive session: its model stays in memory so later solves
+    only apply the edited bounds. Idle sessions are evicted.
+    """
+    session = session_manager.create(current_catalog())
+    return {"id": session.id, "idle_timeout": session_manager.idle_timeout}, 201, \
+        {'Location': f"/sessions/{session.id}"}
+
+
+@app.route('/sessions/<session_id>/optimize', methods=['POST'])
+def optimize_session(session_id):
+    """
+    /api/optimize through a session. Adds "resolve": what the session reused
+    (cached / rebuilt / changed_rows / warm_start / reused) and solve_time.
+    Approximate solves don't need the session's model and bypass it.
+    """
+    session = session_manager.get(session_id)
+    if session is None:
+        abort(404)
+    try:
+        options = read_solve_options()
+        constraints = read_constraints()
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
 
-    # If not Optimal, return a small HTML snippet
-    if solution['status'] != 'Optimal':
+    exact = options['mode'] == 'exact'
+    resolve = {"cached": True} if exact else {"session": False}
+
+    def session_solve(constraints, catalog):
+        result, info = session.solve(constraints, time_limit=options['time_limit'], gap=options['gap'],
+                                     catalog=catalog)
+        resolve.update(info, cached=False, solve_time=result.solve_time)
+        solution = extract_solution(result, catalog)
+        solution['mode'] = 'exact'
+        if options['gap'] is not None and result.status == 'Optimal':
+            solution['gap'] = result.mip_gap
+        return solution
+
+    solve = session_solve if exact else None
+    result = solution_json(solve_cached(constraints, solve=solve, options=options))
+    result['resolve'] = resolve
+    return result
+
+
+@app.route('/sessions/<session_id>', methods=['DELETE'])
+def close_session(session_id):
+    if not session_manager.close(session_id):
+        abort(404)
+    return '', 204
+
+
+@app.route('/chart/<token>.<fmt>')
+def chart(token, fmt):
+    """
+    Render (or serve from cache) the macro chart of a solved plan.
+    The token is the chart data itself (see charts.encode_chart), so the
+    response is immutable and any worker can render it.
+    """
+    if fmt not in charts.RENDERERS:
+        abort(404)
+    renderer, mimetype = charts.RENDERERS[fmt]
+
+    try:
+        chart_data = charts.decode_chart(token)
+    except ValueError:
+        abort(404)
+
+    image = chart_cache.get((token, fmt))
+    if image is None:
+        with PHASE_SECONDS.time(phase='chart'):
+            image = renderer(chart_data)
+        chart_cache.put((token, fmt), image)
+
+    response = Response(image, mimetype=mimetype)
+    response.headers['Cache-Control'] = 'public, max-age=31536000, immutable'
+    response.set_etag(charts.chart_digest(chart_data))
+    return response
+
+
+@app.route('/optimize/batch', methods=['POST'])
+def optimize_batch_route():
+    """
+    Solve a list of constraint sets in parallel and stream the results back
+    as NDJSON, one line per constraint set in completion order:
+        {"index": 3, "status": "Optimal", "objective_value": ..., "quantities": {...}}
+    Body: either a JSON list of constraint dicts or
+        {"constraints": [...], "workers": <optional pool size>}
+    workers is capped at BATCH_WORKERS (default: one per CPU). 503 while
+    BATCH_CONCURRENCY batches are already streaming.
+    """
+    payload = request.get_json()
+    if isinstance(payload, dict):
+        constraint_sets = payload.get('constraints')
+        try:
+            workers = read_workers(payload.get('workers'), BATCH_MAX_WORKERS)
+        except ValueError as exc:
+            return {"error": str(exc)}, 400
+    else:
+        constraint_sets = payload
+        workers = BATCH_MAX_WORKERS
+
+    if not isinstance(constraint_sets, list):
+        return {"error": "Expected a list of constraint sets"}, 400
+
+    if not batch_slots.acquire(blocking=False):
+        return {"error": "Too many batch requests in progress"}, 503, {'Retry-After': '5'}
+
+    catalog = current_catalog()
+
+    def generate():
+        for item in optimize_batch(constraint_sets, catalog, max_workers=workers, backend=solver_backend):
+            yield json.dumps(item) + "\n"
+
+    response = Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+    # Called by the server once the stream ends or the client disconnects
+    response.call_on_close(batch_slots.release)
+    return response
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queue a solve. Body: {"constraints": {...}, "time_limit": <s>, "gap": <relative, in [0, 1)>}.
+    Returns 202 with the job; 400 on bad constraints or gap; 503 if the queue is full.
+    """
+    payload = request.get_json(silent=True)
+    constraints = payload.get('constraints') if isinstance(payload, dict) else None
+    if not isinstance(constraints, dict):
+        return {"error": "Expected 'constraints' to be an object"}, 400
+
+    try:
+        time_limit = float(payload['time_limit']) if payload.get('time_limit') else None
+        gap = float(payload['gap']) if payload.get('gap') is not None else None
+    except (TypeError, ValueError):
+        return {"error": "'time_limit' and 'gap' must be numbers"}, 400
+
+    try:
+        job = job_manager.submit(constraints, time_limit=time_limit, gap=gap)
+    except ValueError as exc:
+        return {"error": str(exc)}, 400
+    except JobQueueFull as exc:
+        return {"error": str(exc)}, 503, {'Retry-After': '5'}
+
+    return job.to_dict(), 202, {'Location': f"/jobs/{job.id}"}
+
+
+@app.route('/jobs/<job_id>', methods=['GET'])
+def get_job(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        abort(404)
+    return job.to_dict()
+
+
+@app.route('/jobs/<job_id>', methods=['DELETE'])
+@app.route('/jobs/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        abort(404)
+    return job.to_dict()
+
+
+@app.route('/jobs/<job_id>/events')
+def job_events(job_id):
+    """
+    Server-sent events: one 'job' event with the full job state on every
+    change (new incumbent, state transition) until the job finishes.
+    """
+    job = job_manager.get(job_id)
+    if job is None:
+        abort(404)
+
+    def generate():
+        version = None
+        while True:
+            if version is not None:
+                version = job.wait_for_change(version, timeout=15)
+            else:
+                version = job.version
+            yield f"event: job\ndata: {json.dumps(job.to_dict())}\n\n"
+            if job.done:
+                return
+
+    return Response(generate(), mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+
+@app.route('/metrics')
+def metrics():
+    """
+    Prometheus text exposition: per-phase latency histograms, request
+    latency, solver status counts, model sizes and cache counters.
+    """
+    return Response(REGISTRY.expose(), mimetype='text/plain; version=0.0.4')
+
+
+@app.route('/cache/stats')
+def cache_stats():
+    """
+    Hit / miss / eviction counters of the result and chart caches, and
+    the state of the preset table.
+    """
+    return {
+        'results': result_cache.stats(),
+        'charts': chart_cache.stats(),
+        'presets': preset_table.stats(),
+    }
+
+
+@app.route('/sessions/stats')
+def session_stats():
+    return session_manager.stats()
+
+
+@app.route('/jobs/stats')
+def job_stats():
+    return job_manager.stats()
+
+
+def render_solution(solution, chart_token):
+    """
+    Render a solution as the HTML snippet returned by /optimize.
+    """
+
+    # If there is no plan, return a small HTML snippet
+    if solution['status'] not in ('Optimal', 'Feasible'):
         return f"""
         <p>Solution Status: {solution['status']}</p>
         <p>No feasible solution found.</p>
         """
 
-    # Build data for a stacked bar chart (protein, carbs, fat)
-    selected_foods = []
-    protein_vals = []
-    carbs_vals = []
-    fat_vals = []
-
-    for food_name, qty in solution['quantities'].items():
-        selected_foods.append(food_name)
-
-        protein = foods_data[food_name].get('protein', 0)
-        carbs   = foods_data[food_name].get('carbs',   0)
-        fat     = foods_data[food_name].get('fat',     0)
-
-        protein_vals.append(protein * qty)
-        carbs_vals.append(carbs * qty)
-        fat_vals.append(fat * qty)
-
-    # Generate Matplotlib figure
-    fig, ax = plt.subplots(figsize=(7, 5))
-    x_positions = range(len(selected_foods))
-
-    # Protein bars
-    ax.bar(x_positions, protein_vals, label='Protein (g)', color='steelblue')
-    # Carbs on top
-    bottom_for_carbs = protein_vals
-    ax.bar(x_positions, carbs_vals, bottom=bottom_for_carbs, label='Carbs (g)', color='gold')
-    # Fat on top
-    bottom_for_fat = [p + c for p, c in zip(protein_vals, carbs_vals)]
-    ax.bar(x_positions, fat_vals, bottom=bottom_for_fat, label='Fat (g)', color='salmon')
-
-    ax.set_xticks(list(x_positions))
-    ax.set_xticklabels(selected_foods, rotation=45, ha='right')
-    ax.set_ylabel('Grams')
-    ax.set_title('Macro Contributions by Selected Foods')
-    ax.legend()
-    plt.tight_layout()
-
-    # Convert to base64
-    png_buffer = io.BytesIO()
-    fig.savefig(png_buffer, format='png')
-    png_buffer.seek(0)
-    encoded_chart = base64.b64encode(png_buffer.read()).decode()
-    plt.close(fig)
-
     # Build an HTML snippet containing the solution + chart
     html_response = f"""
     <h2>Solution Status: {solution['status']}</h2>
     <p>Objective Value (Total Cost): {solution['objective_value']}</p>
+    """
+    if solution.get('gap') is not None:
+        html_response += f"<p>Mode: {solution.get('mode', 'exact')}, within {solution['gap']:.2%} of optimal</p>"
+    html_response += """
     <h3>Quantities:</h3>
     <ul>
     """
@@ -112,7 +628,7 @@ def optimize():
 
     html_response += f"""
     <h3>Macro Chart</h3>
-    <img src="data:image/png;base64,{encoded_chart}" alt="Stacked Bar Chart" />
+    <img src="/chart/{chart_token}.png" alt="Stacked Bar Chart" />
     """
 
     return html_response
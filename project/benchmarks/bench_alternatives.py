@@ -0,0 +1,99 @@
+"""
+Top-k alternative plans: alternative_plans (one model, exclusion cuts
+added between solves) against k independent calls.
+
+  - one model:     alternative_plans(k)
+  - cold rebuilds: the same k plans, but every solve builds a fresh model
+                   and re-adds the budget and all earlier cuts
+  - resubmits:     k optimize_nutrition calls, i.e. what a user tweaking
+                   constraints costs today (no alternatives guaranteed)
+
+    python -m benchmarks.bench_alternatives --sizes 29 1000 --k 10 --runs 5
+"""
+import time
+
+import numpy as np
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog, random_constraints
+from optimization.alternatives import alternative_plans, cut_pool, quantity_bounds
+from optimization.backends import get_backend
+from optimization.ilp_solver import optimize_nutrition
+from optimization.model import build_model
+from optimization.presolve import column_upper_bounds
+
+
+def cold_rebuilds(constraints, catalog, backend, k, tolerance):
+    """
+    The alternative_plans loop with a new model for every solve.
+    Returns the number of plans found.
+    """
+    budget = big_m = None
+    supports = []
+    for _ in range(k):
+        model = build_model(constraints, catalog)
+        model.col_upper = column_upper_bounds(model)
+        pool = cut_pool(model, backend)
+        if budget is not None:
+            pool.add_budget(budget)
+        for support in supports:
+            pool.exclude(support, big_m)
+
+        result = pool.solve()
+        if result.status != 'Optimal':
+            break
+        if budget is None:
+            budget = result.objective_value * (1 + tolerance) + 1e-9
+            big_m = quantity_bounds(model, budget)
+        support = np.flatnonzero(np.rint(result.values) > 0)
+        if len(support) == 0:
+            break
+        supports.append(support)
+    return len(supports)
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29, 1000])
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    parser.add_argument('--runs', type=int, default=5, help="constraint sets per size")
+    args = parser.parse_args()
+    backend = get_backend(args.backend)
+
+    report = BenchReport('alternatives', args, [
+        ('foods', 'foods', 'd'), ('plans', 'plans', '.1f'), ('one_model_ms', 'one model ms', '.1f'),
+        ('cold_rebuilds_ms', 'cold rebuilds ms', '.1f'), ('resubmits_ms', 'resubmits ms', '.1f'),
+        ('speedup', 'speedup', '.1f'),
+    ])
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+        one, cold, resubmit, plans = [], [], [], []
+        for constraints in random_constraints(args.runs, seed=9):
+            t = time.perf_counter()
+            found = alternative_plans(constraints, catalog, k=args.k, tolerance=args.tolerance, backend=backend)
+            one.append(time.perf_counter() - t)
+            plans.append(len(found['plans']))
+
+            t = time.perf_counter()
+            cold_rebuilds(constraints, catalog, backend, args.k, args.tolerance)
+            cold.append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            for _ in range(args.k):
+                optimize_nutrition(constraints, catalog, backend=backend)
+            resubmit.append(time.perf_counter() - t)
+
+        report.add(
+            foods=n,
+            backend=backend.name,
+            plans=float(np.mean(plans)),
+            one_model_ms=float(np.median(one) * 1000),
+            cold_rebuilds_ms=float(np.median(cold) * 1000),
+            resubmits_ms=float(np.median(resubmit) * 1000),
+            speedup=float(np.median(cold) / np.median(one)),
+        )
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Approximate mode (LP relaxation + rounding + repair) against exact solves:
+latency, the reported gap to the LP bound and the true gap to the optimum.
+
+Presolve reductions are warmed up first, so timings are per keystroke
+of a user editing the form, not first-request costs.
+
+    python -m benchmarks.bench_approx --sizes 29 1000 --solves 30
+"""
+import time
+
+import numpy as np
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog, random_constraints
+from optimization.ilp_solver import optimize_nutrition
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29, 1000])
+    parser.add_argument('--solves', type=int, default=30)
+    args = parser.parse_args()
+
+    report = BenchReport('approx', args, [
+        ('foods', 'foods', 'd'), ('approx_p50_ms', 'approx p50 ms', '.2f'),
+        ('approx_p95_ms', 'approx p95 ms', '.2f'), ('exact_p50_ms', 'exact p50 ms', '.1f'),
+        ('reported_gap', 'reported gap', '.1%'), ('true_gap', 'true gap', '.1%'),
+        ('max_true_gap', 'max true', '.1%'), ('no_plan', 'no plan', 'd'),
+    ])
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+        constraint_sets = random_constraints(args.solves, seed=5)
+        for constraints in constraint_sets:
+            optimize_nutrition(constraints, catalog, backend=args.backend, mode='approximate')
+
+        approx, exact, reported, true, no_plan = [], [], [], [], 0
+        for constraints in constraint_sets:
+            t = time.perf_counter()
+            a = optimize_nutrition(constraints, catalog, backend=args.backend, mode='approximate')
+            approx.append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            e = optimize_nutrition(constraints, catalog, backend=args.backend)
+            exact.append(time.perf_counter() - t)
+
+            if e['objective_value'] is None:
+                continue
+            if a['objective_value'] is None:
+                no_plan += 1
+                continue
+            reported.append(a['gap'])
+            true.append((a['objective_value'] - e['objective_value']) / e['objective_value']
+                        if e['objective_value'] else 0.0)
+
+        ms = np.array(approx) * 1000
+        report.add(
+            foods=n,
+            approx_p50_ms=float(np.percentile(ms, 50)),
+            approx_p95_ms=float(np.percentile(ms, 95)),
+            exact_p50_ms=float(np.median(exact) * 1000),
+            reported_gap=float(np.mean(reported)) if reported else None,
+            true_gap=float(np.mean(true)) if true else None,
+            max_true_gap=float(np.max(true)) if true else None,
+            no_plan=no_plan,
+        )
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""
+Per-solve latency and throughput of each available solver backend.
+
+Every backend solves the same random constraint sets on the same catalog;
+model building is excluded from the timings.
+
+    python -m benchmarks.bench_backends --sizes 29 1000 --solves 50
+"""
+import time
+
+import numpy as np
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog, random_constraints
+from optimization.backends import BACKENDS, get_backend
+from optimization.model import build_model
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29, 1000], backend=False)
+    parser.add_argument('--solves', type=int, default=50)
+    parser.add_argument('--backends', nargs='+', default=[n for n, cls in BACKENDS.items() if cls.available()])
+    args = parser.parse_args()
+
+    report = BenchReport('backends', args, [
+        ('foods', 'foods', 'd'), ('backend', 'backend', 's'), ('mean_ms', 'mean ms', '.2f'),
+        ('p50_ms', 'p50 ms', '.2f'), ('p95_ms', 'p95 ms', '.2f'), ('solves_per_s', 'solves/s', '.1f'),
+    ])
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+        models = [build_model(c, catalog) for c in random_constraints(args.solves)]
+
+        for name in args.backends:
+            backend = get_backend(name)
+            backend.solve(models[0])  # warm-up
+
+            latencies = []
+            start = time.perf_counter()
+            for model in models:
+                t = time.perf_counter()
+                backend.solve(model)
+                latencies.append(time.perf_counter() - t)
+            elapsed = time.perf_counter() - start
+
+            ms = np.array(latencies) * 1000
+            report.add(
+                foods=n,
+                backend=name,
+                mean_ms=float(ms.mean()),
+                p50_ms=float(np.percentile(ms, 50)),
+                p95_ms=float(np.percentile(ms, 95)),
+                solves_per_s=len(models) / elapsed,
+            )
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+"""
+Catalog load time and resident memory: json.load + FoodCatalog (the old
+startup path) vs compiling the store vs opening the compiled, memory-mapped
+catalog. Each case runs in a fresh interpreter so its RSS is its own.
+
+    python -m benchmarks.bench_catalog_store --sizes 29 10000 300000
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import FOODS_FILE, real_size, synthetic_foods_data
+
+CASES = ('json', 'compile', 'mmap')
+
+
+def rss_mb():
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def run_case(case, source, cache_dir):
+    """
+    One case in this process; prints {"seconds", "rss_mb"} as JSON.
+    """
+    from optimization.catalog import FoodCatalog
+    from optimization.store import MappedCatalog, compile_catalog
+
+    before = rss_mb()
+    start = time.perf_counter()
+    if case == 'json':
+        catalog = FoodCatalog.from_json(source)
+    else:
+        # 'compile' finds an empty cache; 'mmap' reuses what 'compile' wrote
+        catalog = MappedCatalog(compile_catalog(source, cache_dir))
+    # Touch one food so lazy structures are exercised
+    catalog.food(catalog.names[len(catalog) // 2])
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "rss_mb": rss_mb() - before}))
+
+
+def measure(case, source, cache_dir):
+    out = subprocess.run(
+        [sys.executable, '-m', 'benchmarks.bench_catalog_store', '--run-case', case, source, cache_dir],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29, 10000, 300000], backend=False)
+    parser.add_argument('--run-case', nargs=3, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        run_case(*args.run_case)
+        return
+
+    del args.run_case
+    report = BenchReport('catalog_store', args, [
+        ('foods', 'foods', 'd'), ('case', 'case', 's'), ('ms', 'time ms', '.1f'), ('rss_mb', 'rss MB', '.1f'),
+    ])
+    for n in args.sizes:
+        with tempfile.TemporaryDirectory() as tmp:
+            source = FOODS_FILE
+            if n != real_size():
+                source = os.path.join(tmp, 'foods.json')
+                with open(source, 'w') as f:
+                    json.dump(synthetic_foods_data(n), f)
+            cache_dir = os.path.join(tmp, 'cache')
+            for case in CASES:
+                r = measure(case, source, cache_dir)
+                report.add(foods=n, case=case, ms=r['seconds'] * 1000, rss_mb=r['rss_mb'])
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Model build time vs. catalog size.
+
+Compares the original per-constraint dict comprehensions against the
+matrix builder (build_model) and its PuLP translation (to_pulp).
+
+    python -m benchmarks.bench_model_build --sizes 30 1000 10000 100000
+"""
+import time
+
+import pulp
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_foods_data
+from optimization.catalog import FoodCatalog
+from optimization.model import CONSTRAINT_FIELDS, build_model, to_pulp
+
+CONSTRAINTS = {
+    'min_calories': '2250', 'max_calories': '3000', 'min_protein': '120',
+    'min_fiber': '32', 'max_sugars': '50', 'min_vitamin_c': '75',
+}
+
+
+def legacy_build(constraints, foods_data):
+    """
+    The pre-catalog builder: one pass over the foods dict per constraint.
+    """
+    problem = pulp.LpProblem("Nutrition_Optimization", pulp.LpMinimize)
+    food_items = list(foods_data.keys())
+    x = pulp.LpVariable.dicts('quantity', food_items, lowBound=0, cat=pulp.LpInteger)
+    problem += pulp.lpSum([foods_data[f]['cost'] * x[f] for f in food_items]), "Total_Cost"
+    for field, (nutrient, sense, name) in CONSTRAINT_FIELDS.items():
+        if constraints.get(field):
+            expr = pulp.lpSum([foods_data[f].get(nutrient, 0) * x[f] for f in food_items])
+            rhs = float(constraints[field])
+            problem += (expr >= rhs if sense == '>=' else expr <= rhs), name
+    return problem
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[30, 1000, 10000, 100000], backend=False)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    report = BenchReport('model_build', args, [
+        ('foods', 'foods', 'd'), ('legacy_s', 'legacy s', '.4f'), ('catalog_s', 'catalog s', '.4f'),
+        ('matrix_s', 'matrix s', '.4f'), ('to_pulp_s', 'to_pulp s', '.4f'), ('speedup', 'speedup', '.1f'),
+    ])
+    for n in args.sizes:
+        foods_data = bench_foods_data(n)
+        catalog = FoodCatalog.from_foods_data(foods_data)
+
+        t_legacy = timed(lambda: legacy_build(CONSTRAINTS, foods_data), args.repeat)
+        t_catalog = timed(lambda: FoodCatalog.from_foods_data(foods_data), 1)
+        t_matrix = timed(lambda: build_model(CONSTRAINTS, catalog), args.repeat)
+        t_pulp = timed(lambda: to_pulp(build_model(CONSTRAINTS, catalog)), args.repeat)
+
+        report.add(foods=n, legacy_s=t_legacy, catalog_s=t_catalog, matrix_s=t_matrix, to_pulp_s=t_pulp,
+                   speedup=t_legacy / t_pulp)
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Solve time with and without presolve (dominated-food removal + upper
+bounds from max constraints), and a check that the optimal cost is the same.
+
+Timings include model building; "presolve" is the first (uncached)
+reduction of each constraint signature, later ones hit the cache.
+
+    python -m benchmarks.bench_presolve --sizes 29 1000 10000 --solves 20
+"""
+import time
+
+import numpy as np
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog, random_constraints
+from optimization.backends import get_backend
+from optimization.ilp_solver import optimize_nutrition
+from optimization.presolve import PresolveCache, presolved_model
+
+
+def same_optimum(a, b):
+    if a['status'] != b['status']:
+        return False
+    if a['objective_value'] is None or b['objective_value'] is None:
+        return a['objective_value'] == b['objective_value']
+    return abs(a['objective_value'] - b['objective_value']) < 1e-6
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29, 1000, 10000])
+    parser.add_argument('--solves', type=int, default=20)
+    args = parser.parse_args()
+
+    backend = get_backend(args.backend)
+    report = BenchReport('presolve', args, [
+        ('foods', 'foods', 'd'), ('removed', 'removed', '.1%'), ('presolve_ms', 'presolve ms', '.1f'),
+        ('off_mean_ms', 'off mean ms', '.1f'), ('on_mean_ms', 'on mean ms', '.1f'), ('saved', 'saved', '.0%'),
+        ('same_cost', 'same cost', 'd'),
+    ])
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+        constraint_sets = random_constraints(args.solves)
+
+        first = []
+        cache = PresolveCache()
+        for constraints in constraint_sets:
+            _, info = presolved_model(constraints, catalog, cache=cache)
+            if not info['cached']:
+                first.append(info['time'])
+
+        off, on, removed, same = [], [], [], 0
+        for constraints in constraint_sets:
+            t = time.perf_counter()
+            plain = optimize_nutrition(constraints, catalog, backend=backend, presolve=False)
+            off.append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            reduced = optimize_nutrition(constraints, catalog, backend=backend)
+            on.append(time.perf_counter() - t)
+
+            removed.append(reduced['presolve']['removed'])
+            same += same_optimum(plain, reduced)
+
+        report.add(
+            foods=n,
+            backend=backend.name,
+            removed=float(np.mean(removed) / n),
+            presolve_ms=float(np.mean(first) * 1000),
+            off_mean_ms=float(np.mean(off) * 1000),
+            on_mean_ms=float(np.mean(on) * 1000),
+            saved=float(1 - np.mean(on) / np.mean(off)),
+            same_cost=same,
+            solves=len(constraint_sets),
+        )
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
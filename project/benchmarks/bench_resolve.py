@@ -0,0 +1,86 @@
+"""
+Interactive re-solve latency: a ModelSession (model kept in memory, bounds
+edited in place, warm start) against a cold build + solve per edit.
+
+Each run starts from the body-weight defaults and applies random one-field
+edits (+/- 5-10% on one bound, or clearing / restoring a field).
+
+    python -m benchmarks.bench_resolve --sizes 29 300 --edits 40
+"""
+import time
+
+import numpy as np
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog
+from optimization.backends import get_backend
+from optimization.model import build_model
+from optimization.sessions import ModelSession
+
+DEFAULTS = {
+    'min_calories': 2250, 'max_calories': 3000, 'min_protein': 120,
+    'min_fiber': 32, 'max_sugars': 50, 'min_vitamin_c': 75,
+}
+
+
+def edit_sequence(n_edits, seed=0):
+    rng = np.random.default_rng(seed)
+    current = dict(DEFAULTS)
+    sequence = [{k: str(v) for k, v in current.items()}]
+    for _ in range(n_edits):
+        field = rng.choice(list(DEFAULTS))
+        if rng.random() < 0.1:
+            current[field] = '' if current[field] != '' else DEFAULTS[field]
+        else:
+            base = current[field] if current[field] != '' else DEFAULTS[field]
+            current[field] = round(base * rng.uniform(0.9, 1.1))
+        sequence.append({k: str(v) for k, v in current.items()})
+    return sequence
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29, 300], backend=False)
+    parser.add_argument('--edits', type=int, default=40)
+    args = parser.parse_args()
+
+    backend = get_backend('highs')
+    report = BenchReport('resolve', args, [
+        ('foods', 'foods', 'd'), ('cold_mean_ms', 'cold mean ms', '.1f'),
+        ('session_mean_ms', 'session mean ms', '.1f'), ('reused', 'reused', 'd'),
+        ('same_cost', 'same cost', 'd'), ('edits', 'edits', 'd'),
+    ])
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+        sequence = edit_sequence(args.edits)
+
+        session = ModelSession(catalog, backend)
+        session.solve(sequence[0])
+
+        cold, warm, reused, same = [], [], 0, 0
+        for constraints in sequence[1:]:
+            t = time.perf_counter()
+            cold_result = backend.solve(build_model(constraints, catalog))
+            cold.append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            warm_result, info = session.solve(constraints)
+            warm.append(time.perf_counter() - t)
+
+            reused += info['reused']
+            same += (cold_result.status == warm_result.status and
+                     (cold_result.objective_value is None or
+                      abs(cold_result.objective_value - warm_result.objective_value) < 1e-6))
+
+        report.add(
+            foods=n,
+            cold_mean_ms=float(np.mean(cold) * 1000),
+            session_mean_ms=float(np.mean(warm) * 1000),
+            reused=reused,
+            same_cost=same,
+            edits=len(cold),
+        )
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,59 @@
+"""
+Parametric sweep: sweep_nutrition (one model per segment, bound edits,
+reuse / warm start) against one cold optimize_nutrition call per point.
+
+    python -m benchmarks.bench_sweep --sizes 29 --parameter min_protein --start 50 --stop 250 --step 5
+"""
+import time
+
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog
+from optimization.ilp_solver import optimize_nutrition
+from optimization.sweep import sweep_nutrition, sweep_values
+
+BASE = {'min_calories': '2000', 'max_calories': '3000', 'min_fiber': '25', 'max_sugars': '50'}
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29])
+    parser.add_argument('--parameter', default='min_protein')
+    parser.add_argument('--start', type=float, default=50)
+    parser.add_argument('--stop', type=float, default=250)
+    parser.add_argument('--step', type=float, default=5)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4])
+    args = parser.parse_args()
+
+    report = BenchReport('sweep', args, [
+        ('foods', 'foods', 'd'), ('points', 'points', 'd'), ('workers', 'workers', 'd'),
+        ('cold_s', 'cold s', '.3f'), ('sweep_s', 'sweep s', '.3f'), ('speedup', 'speedup', '.1f'),
+        ('same_frontier', 'same frontier', ''),
+    ])
+    values = sweep_values(args.start, args.stop, args.step)
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+
+        start = time.perf_counter()
+        cold = [
+            optimize_nutrition(dict(BASE, **{args.parameter: str(v)}), catalog, backend=args.backend)['objective_value']
+            for v in values
+        ]
+        t_cold = time.perf_counter() - start
+
+        for workers in args.workers:
+            start = time.perf_counter()
+            result = sweep_nutrition(BASE, catalog, args.parameter, args.start, args.stop, args.step,
+                                     workers=workers, backend=args.backend)
+            t_sweep = time.perf_counter() - start
+
+            same = all(
+                (a is None and p['objective_value'] is None) or
+                (a is not None and p['objective_value'] is not None and abs(a - p['objective_value']) < 1e-6)
+                for a, p in zip(cold, result['points'])
+            )
+            report.add(foods=n, points=len(values), workers=workers, cold_s=t_cold, sweep_s=t_sweep,
+                       speedup=t_cold / t_sweep, same_frontier=same)
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Weekly planner: the decomposed method (LP bound, rolling horizon,
+parallel fix-and-optimize windows) against the monolithic MIP, on the
+form's default constraints for a few body weights.
+
+Reports per method the wall time, the week's cost and its gap to that
+method's own lower bound (LP bound for decomposed, MIP bound for
+monolithic), and the decomposed week's extra cost over the monolithic one
+(negative when the monolithic solve hit its time limit first).
+
+    python -m benchmarks.bench_weekly --sizes 29 200 --weights 60 75 90 --max-servings 7 --time-limit 120
+"""
+from benchmarks.suite import BenchReport, bench_parser
+from benchmarks.synthetic import bench_catalog
+from optimization.presets import PRESET_PROFILES, preset_constraints
+from optimization.weekly import DEFAULT_WINDOW, compare_week_plans
+
+
+def main():
+    parser = bench_parser(__doc__, sizes=[29])
+    parser.add_argument('--weights', type=float, nargs='+', default=[60, 75, 90])
+    parser.add_argument('--days', type=int, default=7)
+    parser.add_argument('--max-servings', type=int, default=7)
+    parser.add_argument('--consecutive', action='store_true', help="allow a food on consecutive days")
+    parser.add_argument('--window', type=int, default=DEFAULT_WINDOW)
+    parser.add_argument('--time-limit', type=float, default=120,
+                        help="seconds for both methods (split by compare_week_plans)")
+    args = parser.parse_args()
+
+    report = BenchReport('weekly', args, [
+        ('foods', 'foods', 'd'), ('weight', 'kg', '.0f'),
+        ('decomposed_s', 'decomposed s', '.2f'), ('decomposed_cost', 'cost', '.2f'), ('decomposed_gap', 'gap', '.1%'),
+        ('monolithic_s', 'monolithic s', '.2f'), ('monolithic_cost', 'cost', '.2f'), ('monolithic_gap', 'gap', '.1%'),
+        ('monolithic_status', 'status', 's'), ('cost_gap', 'cost gap', '+.1%'),
+    ])
+    for n in args.sizes:
+        catalog = bench_catalog(n)
+        for weight in args.weights:
+            constraints = preset_constraints(weight, PRESET_PROFILES['default'])
+            result = compare_week_plans(
+                constraints, catalog, days=args.days, max_servings=args.max_servings,
+                no_consecutive=not args.consecutive, window=args.window, backend=args.backend,
+                time_limit=args.time_limit,
+            )
+            dec, mono = result['decomposed'], result['monolithic']
+            report.add(
+                foods=n,
+                weight=weight,
+                decomposed_s=dec['time'],
+                decomposed_cost=dec['objective_value'],
+                decomposed_gap=dec['gap'] if dec['objective_value'] is not None else None,
+                decomposed_status=dec['status'],
+                monolithic_s=mono['time'],
+                monolithic_cost=mono['objective_value'],
+                monolithic_gap=mono['gap'] if mono['objective_value'] is not None else None,
+                monolithic_status=mono['status'],
+                cost_gap=result['cost_gap'],
+            )
+    report.finish()
+
+
+if __name__ == '__main__':
+    main()
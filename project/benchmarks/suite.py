@@ -0,0 +1,308 @@
+"""
+Benchmark suite: per-phase timings of the /optimize path on synthetic
+catalogs, written as JSON so runs can be compared.
+
+Phases, timed separately for every solve:
+  - build:   presolve + NutritionModel (build_model alone with --no-presolve)
+  - solve:   backend.solve (for CBC this includes the PuLP translation)
+  - extract: extract_solution + nutrient totals
+  - render:  chart data + PNG render (Optimal plans only)
+
+Each catalog size is run with feasible and with infeasible constraint sets.
+
+    python -m benchmarks.suite run --sizes 30 1000 10000 100000 --out current.json
+    python -m benchmarks.suite compare baseline.json current.json --threshold 0.2
+
+The per-feature benchmarks (benchmarks/bench_*.py) build their command line
+with bench_parser and write their rows through BenchReport, in the same
+{"meta", "cases"} layout as this suite's reports.
+"""
+import argparse
+import json
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+import charts
+from benchmarks.synthetic import infeasible_constraints, random_constraints, real_size, synthetic_catalog
+from optimization.backends import get_backend
+from optimization.ilp_solver import extract_solution
+from optimization.model import build_model
+from optimization.presolve import PresolveCache, presolved_model
+
+PHASES = ('build', 'solve', 'extract', 'render')
+MIN_FOODS = 30
+MAX_FOODS = 100_000
+
+CONSTRAINT_KINDS = {
+    'feasible': random_constraints,
+    'infeasible': infeasible_constraints,
+}
+
+
+def summarize(seconds):
+    """
+    {"n", "mean_ms", "p50_ms", "p95_ms", "min_ms", "max_ms"} of a list of timings.
+    """
+    if not seconds:
+        return {"n": 0}
+    ms = np.array(seconds) * 1000
+    return {
+        "n": len(ms),
+        "mean_ms": round(float(ms.mean()), 3),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p95_ms": round(float(np.percentile(ms, 95)), 3),
+        "min_ms": round(float(ms.min()), 3),
+        "max_ms": round(float(ms.max()), 3),
+    }
+
+
+def run_case(catalog, constraint_sets, backend, presolve=True, time_limit=None):
+    """
+    Time every phase for each constraint set on `catalog`.
+    Returns {"phases": {phase: summary}, "statuses": {status: count}, "variables": mean}.
+    """
+    timings = {phase: [] for phase in PHASES}
+    statuses = {}
+    variables = []
+    cache = PresolveCache()
+
+    for constraints in constraint_sets:
+        t = time.perf_counter()
+        if presolve:
+            model, _ = presolved_model(constraints, catalog, cache=cache)
+        else:
+            model = build_model(constraints, catalog)
+        timings['build'].append(time.perf_counter() - t)
+        variables.append(model.num_vars)
+
+        t = time.perf_counter()
+        result = backend.solve(model, time_limit=time_limit)
+        timings['solve'].append(time.perf_counter() - t)
+
+        t = time.perf_counter()
+        solution = extract_solution(result, model.catalog)
+        if solution['quantities']:
+            solution['totals'] = catalog.totals(solution['quantities'])
+        timings['extract'].append(time.perf_counter() - t)
+
+        statuses[solution['status']] = statuses.get(solution['status'], 0) + 1
+        if solution['status'] == 'Optimal':
+            t = time.perf_counter()
+            charts.render_png(charts.macro_breakdown(solution, catalog))
+            timings['render'].append(time.perf_counter() - t)
+
+    return {
+        "phases": {phase: summarize(values) for phase, values in timings.items()},
+        "statuses": statuses,
+        "variables": round(float(np.mean(variables)), 1),
+    }
+
+
+def git_revision():
+    try:
+        out = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def report_meta(**params):
+    """
+    The "meta" block of a report: when and where it ran, plus `params`.
+    """
+    return {
+        "time": time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        **params,
+    }
+
+
+def json_value(value):
+    # numpy scalars in report rows
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def bench_parser(doc, sizes=None, backend=True):
+    """
+    Argument parser of a per-feature benchmark: its module docstring as
+    description, --sizes (catalog sizes; see benchmarks.synthetic.bench_catalog)
+    when `sizes` gives the defaults, --backend, and the report options of
+    BenchReport (--json, --out).
+    """
+    parser = argparse.ArgumentParser(description=doc, formatter_class=argparse.RawDescriptionHelpFormatter)
+    if sizes is not None:
+        parser.add_argument('--sizes', type=int, nargs='+', default=sizes,
+                            help=f"catalog sizes; {real_size()} means the real data/foods.json")
+    if backend:
+        parser.add_argument('--backend', default=None)
+    parser.add_argument('--json', action='store_true', help="print the JSON report on stdout")
+    parser.add_argument('--out', help="write the JSON report here")
+    return parser
+
+
+class BenchReport:
+    """
+    Rows of a per-feature benchmark. Each row is printed to stderr as a
+    table line when added; finish() writes {"meta", "cases"} (one case per
+    row, meta holding the command-line arguments) to --out and/or stdout
+    with --json.
+
+    `columns` are (key, header, format spec) triples for the table; rows
+    may carry more keys than are shown, and None prints as '-'.
+    """
+
+    def __init__(self, name, args, columns):
+        params = {k: v for k, v in vars(args).items() if k not in ('json', 'out')}
+        self.meta = report_meta(bench=name, **params)
+        self.columns = columns
+        self.cases = []
+        self.out = args.out
+        self.json = args.json
+        self._widths = [max(len(header), 8) for _, header, _ in columns]
+        print(" ".join(f"{header:>{w}}" for (_, header, _), w in zip(columns, self._widths)), file=sys.stderr)
+
+    def add(self, **row):
+        self.cases.append(row)
+        cells = []
+        for (key, _, spec), width in zip(self.columns, self._widths):
+            value = row.get(key)
+            cells.append(f"{'-' if value is None else format(value, spec):>{width}}")
+        print(" ".join(cells), file=sys.stderr, flush=True)
+
+    def finish(self):
+        output = json.dumps({"meta": self.meta, "cases": self.cases}, indent=2, default=json_value)
+        if self.out:
+            with open(self.out, 'w') as f:
+                f.write(output + "\n")
+        if self.json:
+            print(output)
+
+
+def run(args):
+    backend = get_backend(args.backend)
+    # Warm-up: first solve / first render pay one-off import and startup costs
+    warm = synthetic_catalog(MIN_FOODS, seed=args.seed)
+    run_case(warm, random_constraints(2, seed=args.seed), backend, presolve=not args.no_presolve)
+
+    report = {
+        "meta": report_meta(
+            backend=backend.name,
+            presolve=not args.no_presolve,
+            solves=args.solves,
+            seed=args.seed,
+            time_limit=args.time_limit,
+        ),
+        "cases": [],
+    }
+    for n in args.sizes:
+        catalog = synthetic_catalog(n, seed=args.seed)
+        for kind in args.kinds:
+            constraint_sets = CONSTRAINT_KINDS[kind](args.solves, seed=args.seed)
+            case = run_case(catalog, constraint_sets, backend, presolve=not args.no_presolve,
+                            time_limit=args.time_limit)
+            report["cases"].append({"foods": n, "kind": kind, **case})
+            phases = "  ".join(
+                f"{phase} {case['phases'][phase]['p50_ms']:.1f}ms" for phase in PHASES
+                if case['phases'][phase]['n']
+            )
+            print(f"{n:>7} {kind:>10}  {phases}  {case['statuses']}", file=sys.stderr)
+
+    output = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(output + "\n")
+    else:
+        print(output)
+
+
+def compare(args):
+    """
+    Compare the p50 of every (foods, kind, phase) between two reports. A
+    phase regresses if it is more than `threshold` slower and at least
+    `min_ms` slower in absolute terms. Exit status 1 if anything regressed.
+    """
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+
+    if baseline['meta']['backend'] != current['meta']['backend']:
+        print(f"warning: comparing backend {baseline['meta']['backend']!r} "
+              f"with {current['meta']['backend']!r}", file=sys.stderr)
+
+    base_cases = {(c['foods'], c['kind']): c for c in baseline['cases']}
+    rows = []
+    for case in current['cases']:
+        base = base_cases.get((case['foods'], case['kind']))
+        if base is None:
+            continue
+        for phase in PHASES:
+            old = base['phases'][phase].get('p50_ms')
+            new = case['phases'][phase].get('p50_ms')
+            if old is None or new is None:
+                continue
+            change = new / old - 1 if old else 0.0
+            regressed = change > args.threshold and new - old >= args.min_ms
+            rows.append({
+                "foods": case['foods'], "kind": case['kind'], "phase": phase,
+                "baseline_ms": old, "current_ms": new, "change": round(change, 4),
+                "regressed": regressed,
+            })
+
+    if args.json:
+        print(json.dumps({"threshold": args.threshold, "results": rows}, indent=2))
+    else:
+        print(f"{'foods':>7} {'kind':>10} {'phase':>8} {'baseline':>10} {'current':>10} {'change':>8}")
+        for r in rows:
+            flag = "  REGRESSION" if r['regressed'] else ""
+            print(f"{r['foods']:>7} {r['kind']:>10} {r['phase']:>8} {r['baseline_ms']:>8.1f}ms "
+                  f"{r['current_ms']:>8.1f}ms {r['change']:>+8.1%}{flag}")
+
+    return 1 if any(r['regressed'] for r in rows) else 0
+
+
+def foods_count(value):
+    n = int(value)
+    if not MIN_FOODS <= n <= MAX_FOODS:
+        raise argparse.ArgumentTypeError(f"catalog size must be between {MIN_FOODS} and {MAX_FOODS}")
+    return n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the suite and write a JSON report")
+    run_parser.add_argument('--sizes', type=foods_count, nargs='+', default=[30, 1000, 10000])
+    run_parser.add_argument('--kinds', nargs='+', choices=sorted(CONSTRAINT_KINDS), default=list(CONSTRAINT_KINDS))
+    run_parser.add_argument('--solves', type=int, default=10, help="constraint sets per size and kind")
+    run_parser.add_argument('--backend', default=None)
+    run_parser.add_argument('--no-presolve', action='store_true')
+    run_parser.add_argument('--time-limit', type=float, default=None, help="per-solve limit in seconds")
+    run_parser.add_argument('--seed', type=int, default=0)
+    run_parser.add_argument('--out', help="write the report here instead of stdout")
+
+    compare_parser = commands.add_parser('compare', help="flag regressions between two reports")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help="relative slowdown to flag")
+    compare_parser.add_argument('--min-ms', type=float, default=1.0, help="ignore slowdowns smaller than this")
+    compare_parser.add_argument('--json', action='store_true', help="machine-readable comparison")
+
+    args = parser.parse_args()
+    if args.command == 'run':
+        run(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+import functools
+import json
+import os
+
+import numpy as np
+
+from optimization.catalog import FoodCatalog
+
+FOODS_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "foods.json")
+
+
+def load_foods_data():
+    with open(FOODS_FILE, 'r') as f:
+        return json.load(f)
+
+
+@functools.lru_cache(maxsize=None)
+def real_size():
+    """
+    Number of foods in data/foods.json: the catalog size that means "the
+    real data" in every benchmark's --sizes.
+    """
+    return len(load_foods_data())
+
+
+def synthetic_foods_data(n_foods, seed=0):
+    """
+    Generate `n_foods` foods with the same nutrient schema as data/foods.json
+    by resampling the real foods and jittering every value by +/-30%.
+    """
+    base = load_foods_data()
+    base_names = list(base)
+    rng = np.random.default_rng(seed)
+
+    foods = {}
+    for i, k in enumerate(rng.integers(0, len(base_names), size=n_foods)):
+        template = base[base_names[k]]
+        scale = rng.uniform(0.7, 1.3, size=len(template))
+        foods[f"{base_names[k]}_{i}"] = {
+            key: round(float(value) * s, 3) for (key, value), s in zip(template.items(), scale)
+        }
+    return foods
+
+
+def synthetic_catalog(n_foods, seed=0):
+    return FoodCatalog.from_foods_data(synthetic_foods_data(n_foods, seed=seed))
+
+
+def bench_foods_data(n_foods, seed=0):
+    """
+    The foods of data/foods.json when `n_foods` is its size (see real_size),
+    else `n_foods` synthetic ones.
+    """
+    if n_foods == real_size():
+        return load_foods_data()
+    return synthetic_foods_data(n_foods, seed=seed)
+
+
+def bench_catalog(n_foods, seed=0):
+    """
+    FoodCatalog of bench_foods_data(n_foods, seed).
+    """
+    if n_foods == real_size():
+        return FoodCatalog.from_json(FOODS_FILE)
+    return synthetic_catalog(n_foods, seed=seed)
+
+
+def random_constraints(n_sets, seed=0):
+    """
+    `n_sets` constraint dicts shaped like the form's body-weight defaults
+    (templates/index.html), with a random weight and some fields left empty.
+    """
+    rng = np.random.default_rng(seed)
+    sets = []
+    for _ in range(n_sets):
+        weight = rng.uniform(45, 120)
+        min_cal = round(weight * 30)
+        constraints = {
+            'min_calories': str(min_cal),
+            'max_calories': str(round(weight * 40)),
+            'min_protein': str(round(weight * 1.6)),
+            'min_fiber': str(round(14 * min_cal / 1000)),
+            'max_sugars': '50',
+            'min_vitamin_c': '75',
+        }
+        for field in list(constraints):
+            if rng.random() < 0.25:
+                constraints[field] = ''
+        sets.append(constraints)
+    return sets
+
+
+def infeasible_constraints(n_sets, seed=0):
+    """
+    `n_sets` constraint dicts that no plan can satisfy: the random
+    body-weight sets with max_calories pushed below min_calories.
+    """
+    sets = []
+    rng = np.random.default_rng(seed)
+    for constraints in random_constraints(n_sets, seed=seed):
+        weight = rng.uniform(45, 120)
+        min_cal = round(weight * 30)
+        constraints.update(min_calories=str(min_cal), max_calories=str(round(min_cal * 0.9)))
+        sets.append(constraints)
+    return sets
@@ -0,0 +1,182 @@
+import base64
+import binascii
+import hashlib
+import io
+import json
+import zlib
+from xml.sax.saxutils import escape
+
+# (nutrient, legend label, color) for the stacked bars, bottom to top
+MACROS = [
+    ('protein', 'Protein (g)', 'steelblue'),
+    ('carbs',   'Carbs (g)',   'gold'),
+    ('fat',     'Fat (g)',     'salmon'),
+]
+
+CHART_TITLE = 'Macro Contributions by Selected Foods'
+
+# Limits on chart tokens taken from URLs, so a crafted one can't ask for an
+# arbitrarily large render
+MAX_TOKEN_LENGTH = 8192
+MAX_CHART_FOODS = 200
+
+
+def macro_breakdown(solution, catalog):
+    """
+    Chart data for a solution: selected foods and grams of each macro they
+    contribute. Independent of the catalog once built.
+    """
+    foods = list(solution['quantities'])
+    series = {nutrient: [] for nutrient, _, _ in MACROS}
+    for food_name in foods:
+        qty = solution['quantities'][food_name]
+        food = catalog.food(food_name)
+        for nutrient in series:
+            series[nutrient].append(round(food.get(nutrient, 0) * qty, 6))
+    return {'foods': foods, 'series': series}
+
+
+def chart_digest(chart_data):
+    """
+    Content address of a chart: identical data always maps to the same key.
+    """
+    payload = json.dumps(chart_data, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def encode_chart(chart_data):
+    """
+    URL-safe token holding the chart data itself, so any process can render
+    the chart from its URL alone (no server-side state to share or evict).
+    """
+    payload = [chart_data['foods']] + [chart_data['series'][n] for n, _, _ in MACROS]
+    raw = zlib.compress(json.dumps(payload, separators=(',', ':')).encode(), 9)
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_chart(token):
+    """
+    Inverse of encode_chart. Raises ValueError on a malformed or oversized token.
+    """
+    if len(token) > MAX_TOKEN_LENGTH:
+        raise ValueError("Chart token too long")
+    try:
+        raw = zlib.decompressobj().decompress(
+            base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)), MAX_TOKEN_LENGTH * 16
+        )
+        payload = json.loads(raw)
+    except (binascii.Error, zlib.error, ValueError):
+        raise ValueError("Malformed chart token") from None
+
+    if not isinstance(payload, list) or len(payload) != len(MACROS) + 1:
+        raise ValueError("Malformed chart token")
+    foods, *columns = payload
+    if not isinstance(foods, list) or len(foods) > MAX_CHART_FOODS or \
+            not all(isinstance(f, str) for f in foods):
+        raise ValueError("Malformed chart token")
+    for column in columns:
+        if not isinstance(column, list) or len(column) != len(foods) or \
+                not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in column):
+            raise ValueError("Malformed chart token")
+    return {'foods': foods, 'series': {n: col for (n, _, _), col in zip(MACROS, columns)}}
+
+
+def render_png(chart_data):
+    """
+    Stacked bar chart as PNG bytes. Matplotlib is imported here, on first
+    use, so processes that never draw a chart never load it.
+    """
+    # Figure + Agg canvas directly: no pyplot state, no GUI backend
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(7, 5))
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    foods = chart_data['foods']
+    x_positions = range(len(foods))
+    bottom = [0.0] * len(foods)
+    for nutrient, label, color in MACROS:
+        values = chart_data['series'][nutrient]
+        ax.bar(x_positions, values, bottom=bottom, label=label, color=color)
+        bottom = [b + v for b, v in zip(bottom, values)]
+
+    ax.set_xticks(list(x_positions))
+    ax.set_xticklabels(foods, rotation=45, ha='right')
+    ax.set_ylabel('Grams')
+    ax.set_title(CHART_TITLE)
+    ax.legend()
+    fig.tight_layout()
+
+    png_buffer = io.BytesIO()
+    fig.savefig(png_buffer, format='png')
+    return png_buffer.getvalue()
+
+
+def render_svg(chart_data, width=700, height=500):
+    """
+    Same chart as a hand-written SVG string: no Matplotlib, a few KB.
+    """
+    foods = chart_data['foods']
+    left, right, top, bottom_margin = 60, 20, 40, 120
+    plot_w = width - left - right
+    plot_h = height - top - bottom_margin
+
+    totals = [sum(chart_data['series'][n][i] for n, _, _ in MACROS) for i in range(len(foods))]
+    y_max = max(totals, default=0) or 1.0
+    slot = plot_w / max(len(foods), 1)
+    bar_w = slot * 0.8
+
+    def y(value):
+        return top + plot_h - value / y_max * plot_h
+
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" font-size="11">',
+        f'<text x="{width / 2:.1f}" y="22" text-anchor="middle" font-size="14">{CHART_TITLE}</text>',
+        f'<line x1="{left}" y1="{top}" x2="{left}" y2="{top + plot_h}" stroke="black"/>',
+        f'<line x1="{left}" y1="{top + plot_h}" x2="{left + plot_w}" y2="{top + plot_h}" stroke="black"/>',
+        f'<text transform="translate(16 {top + plot_h / 2:.1f}) rotate(-90)" text-anchor="middle">Grams</text>',
+    ]
+
+    # Y ticks
+    for k in range(6):
+        value = y_max * k / 5
+        parts.append(
+            f'<text x="{left - 6}" y="{y(value) + 4:.1f}" text-anchor="end">{value:.0f}</text>'
+        )
+
+    # Stacked bars
+    for i, food in enumerate(foods):
+        x = left + i * slot + (slot - bar_w) / 2
+        base = 0.0
+        for nutrient, label, color in MACROS:
+            value = chart_data['series'][nutrient][i]
+            parts.append(
+                f'<rect x="{x:.1f}" y="{y(base + value):.1f}" width="{bar_w:.1f}" '
+                f'height="{value / y_max * plot_h:.1f}" fill="{color}"><title>{escape(food)}: '
+                f'{value:g} {escape(label)}</title></rect>'
+            )
+            base += value
+        cx = x + bar_w / 2
+        parts.append(
+            f'<text transform="translate({cx:.1f} {top + plot_h + 12}) rotate(-45)" '
+            f'text-anchor="end">{escape(food)}</text>'
+        )
+
+    # Legend
+    for k, (_, label, color) in enumerate(MACROS):
+        ly = top + 8 + k * 16
+        parts.append(f'<rect x="{left + plot_w - 90}" y="{ly}" width="12" height="10" fill="{color}"/>')
+        parts.append(f'<text x="{left + plot_w - 74}" y="{ly + 9}">{escape(label)}</text>')
+
+    parts.append('</svg>')
+    return ''.join(parts)
+
+
+# Output format -> (renderer, mimetype)
+RENDERERS = {
+    'png': (render_png, 'image/png'),
+    'svg': (lambda data: render_svg(data).encode(), 'image/svg+xml'),
+}
@@ -0,0 +1,252 @@
+import math
+import time
+
+import numpy as np
+import pulp
+
+from optimization.backends import HighsBackend, get_backend, highspy, pulp_result
+from optimization.ilp_solver import as_catalog, extract_solution
+from optimization.metrics import PHASE_SECONDS, observe_solve
+from optimization.model import build_model, to_pulp
+from optimization.presolve import column_upper_bounds
+
+# Upper bound on plans per request
+MAX_ALTERNATIVES = 50
+# Indicator bound for a food that neither a '<=' row nor the cost budget
+# limits (only possible for free foods)
+UNBOUNDED_QUANTITY = 1e6
+
+
+def quantity_bounds(model, budget):
+    """
+    Largest quantity of each food in any plan costing at most `budget`:
+    the column bound from the '<=' rows, tightened by budget / cost.
+    """
+    bounds = model.col_upper.copy() if model.col_upper is not None else np.full(model.num_vars, np.inf)
+    cost = np.asarray(model.cost)
+    priced = cost > 0
+    bounds[priced] = np.minimum(bounds[priced], np.floor(budget / cost[priced] + 1e-9))
+    return np.where(np.isinf(bounds), UNBOUNDED_QUANTITY, bounds)
+
+
+class CutPool:
+    """
+    One built model that is re-solved as cuts are added to it:
+      - add_budget(budget):     cost @ x <= budget
+      - exclude(support, big_m): the next plan must not use exactly the foods
+                                 of `support` (indices of a plan's foods)
+    A plan has a different food set if it leaves out a food of S = support
+    or buys a food outside S. Exclusion uses a 0/1 indicator y_j per food of
+    S with x_j <= big_m_j * y_j, and one 0/1 switch z per cut:
+        sum(y_j for j in S) <= |S| - 1 + z      (z = 0: leave a food of S out)
+        sum(x_j for j not in S) >= z            (z = 1: add another food)
+    Quantities are integer, so the second row means at least one unit of a
+    new food. Indicators are added lazily, only for foods that appeared in a
+    plan; supersets of an earlier plan stay allowed.
+    """
+
+    def __init__(self, model):
+        self.model = model
+        self._indicators = {}
+
+    def solve(self, time_limit=None):
+        """
+        SolveResult over the foods only (indicator values are dropped).
+        """
+        raise NotImplementedError
+
+    def add_budget(self, budget):
+        raise NotImplementedError
+
+    def exclude(self, support, big_m):
+        raise NotImplementedError
+
+
+class HighsCutPool(CutPool):
+    """
+    Cuts added to one in-memory Highs instance (addCol / addRow), so each
+    solve only pays for the new rows, not for passing the model again.
+    """
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._highs = highspy.Highs()
+        HighsBackend.configure(self._highs)
+        self._highs.passModel(HighsBackend.to_highs_lp(model))
+
+    def solve(self, time_limit=None):
+        start = time.perf_counter()
+        self._highs.setOptionValue('time_limit', float(time_limit) if time_limit else highspy.kHighsInf)
+        HighsBackend.run(self._highs)
+        result = HighsBackend.result(self._highs, self.model, start)
+        if result.values is not None:
+            result.values = result.values[:self.model.num_vars]
+        return result
+
+    def add_budget(self, budget):
+        cost = np.asarray(self.model.cost)
+        nz = np.flatnonzero(cost)
+        self._highs.addRow(-highspy.kHighsInf, float(budget), len(nz), nz.astype(np.int32), cost[nz])
+
+    def exclude(self, support, big_m):
+        h = self._highs
+        for j in support:
+            if j in self._indicators:
+                continue
+            self._indicators[j] = y = self._add_binary()
+            h.addRow(-highspy.kHighsInf, 0.0, 2, np.array([j, y], dtype=np.int32),
+                     np.array([1.0, -float(big_m[j])]))
+        z = self._add_binary()
+        ys = np.array([self._indicators[j] for j in support] + [z], dtype=np.int32)
+        h.addRow(-highspy.kHighsInf, len(support) - 1.0, len(ys), ys, np.r_[np.ones(len(support)), -1.0])
+        outside = np.setdiff1d(np.arange(self.model.num_vars), support)
+        xs = np.r_[outside, z].astype(np.int32)
+        h.addRow(0.0, highspy.kHighsInf, len(xs), xs, np.r_[np.ones(len(outside)), -1.0])
+
+    def _add_binary(self):
+        h = self._highs
+        col = h.getNumCol()
+        h.addCol(0.0, 0.0, 1.0, 0, np.array([], dtype=np.int32), np.array([], dtype=np.float64))
+        h.changeColIntegrality(col, highspy.HighsVarType.kInteger)
+        return col
+
+
+class PulpCutPool(CutPool):
+    """
+    Cuts added to one PuLP problem. CBC still reads the whole problem from
+    an MPS file on every solve, but nothing is rebuilt.
+    """
+
+    def __init__(self, model):
+        super().__init__(model)
+        self._problem, self._x = to_pulp(model)
+        self._cuts = 0
+
+    def solve(self, time_limit=None):
+        start = time.perf_counter()
+        self._problem.solve(pulp.PULP_CBC_CMD(msg=0, timeLimit=time_limit))
+        return pulp_result(self._problem, self._x, start)
+
+    def add_budget(self, budget):
+        cost = np.asarray(self.model.cost)
+        nz = np.flatnonzero(cost)
+        expression = pulp.LpAffineExpression(zip([self._x[j] for j in nz], cost[nz].tolist()))
+        self._problem += expression <= float(budget), "Budget"
+
+    def exclude(self, support, big_m):
+        for j in support:
+            if j in self._indicators:
+                continue
+            y = pulp.LpVariable(f"uses_{j}", cat=pulp.LpBinary)
+            self._problem += self._x[j] - float(big_m[j]) * y <= 0, f"Uses_{j}"
+            self._indicators[j] = y
+        self._cuts += 1
+        z = pulp.LpVariable(f"differs_{self._cuts}", cat=pulp.LpBinary)
+        self._problem += pulp.lpSum(self._indicators[j] for j in support) - z <= len(support) - 1, \
+            f"Exclude_{self._cuts}"
+        inside = set(support.tolist())
+        self._problem += pulp.lpSum(x for j, x in enumerate(self._x) if j not in inside) - z >= 0, \
+            f"Extend_{self._cuts}"
+
+
+def cut_pool(model, backend):
+    """
+    The CutPool for `backend` (HiGHS in-process, anything else via PuLP + CBC).
+    """
+    if isinstance(backend, HighsBackend):
+        return HighsCutPool(model)
+    return PulpCutPool(model)
+
+
+def alternative_plans(constraints, foods_data, k=5, tolerance=0.1, backend=None, time_limit=None):
+    """
+    The cheapest plan and up to k - 1 alternatives costing at most
+    (1 + tolerance) times as much, from one built model.
+
+    Plans are found in order of cost. After each one, an exclusion cut
+    (see CutPool) rules out its exact food set, so every plan uses a
+    different set of foods (changing only quantities does not make an
+    alternative). Each plan is the cheapest one with a new food set, so the
+    list is the k cheapest distinct food sets, each at its cheapest
+    quantities. Enumeration stops early once no plan is left within the
+    tolerance.
+
+    `time_limit` (seconds) bounds the whole enumeration: each solve gets
+    what is left of it. When it runs out, the plans found so far are
+    returned with "timed_out": true; a plan whose solve was cut short is
+    'Feasible' (not proven the next cheapest) and ends the list.
+
+    The model keeps dominated foods (see optimization.presolve): they
+    cannot be in the cheapest plan but are often in the next ones. Column
+    bounds from the '<=' rows are still applied.
+
+    Returns {"status", "optimum", "tolerance", "plans": [...], "solves",
+    "timed_out", "time"} where "status" is the first solve's status and every plan is
+    {"rank", "status", "objective_value", "quantities", "totals",
+     "over_optimum"} ("over_optimum" is the relative extra cost).
+    """
+    if not 1 <= k <= MAX_ALTERNATIVES:
+        raise ValueError(f"k must be between 1 and {MAX_ALTERNATIVES}")
+    if not (tolerance >= 0 and math.isfinite(tolerance)):
+        raise ValueError("tolerance must be a finite number >= 0")
+    catalog = as_catalog(foods_data)
+    backend = get_backend(backend)
+    start = time.perf_counter()
+
+    with PHASE_SECONDS.time(phase='build'):
+        model = build_model(constraints, catalog)
+        model.col_upper = column_upper_bounds(model)
+        pool = cut_pool(model, backend)
+
+    deadline = start + time_limit if time_limit else None
+    plans = []
+    status = None
+    optimum = None
+    big_m = None
+    solves = 0
+    timed_out = False
+    while len(plans) < k:
+        remaining = None
+        if deadline is not None:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                timed_out = True
+                break
+        result = pool.solve(time_limit=remaining)
+        solves += 1
+        observe_solve(model, result, backend, result.solve_time)
+        if status is None:
+            status = result.status
+        if result.status not in ('Optimal', 'Feasible'):
+            timed_out = result.status == 'Not Solved' and deadline is not None
+            break
+
+        with PHASE_SECONDS.time(phase='extract'):
+            plan = extract_solution(result, catalog)
+            plan["totals"] = catalog.totals(plan["quantities"])
+        if optimum is None:
+            optimum = plan["objective_value"]
+            budget = optimum * (1 + tolerance) + 1e-9
+            big_m = quantity_bounds(model, budget)
+            pool.add_budget(budget)
+        elif plan["objective_value"] > budget:
+            break
+        plan["rank"] = len(plans) + 1
+        plan["over_optimum"] = (plan["objective_value"] - optimum) / optimum if optimum else 0.0
+        plans.append(plan)
+        if result.status == 'Feasible':
+            # Stopped by the time limit: later plans could be cheaper than this one
+            timed_out = True
+            break
+
+        pool.exclude(np.flatnonzero(np.rint(result.values) > 0), big_m)
+
+    return {
+        "status": status,
+        "optimum": optimum,
+        "tolerance": tolerance,
+        "plans": plans,
+        "solves": solves,
+        "timed_out": timed_out,
+        "time": time.perf_counter() - start,
+    }
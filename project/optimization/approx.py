@@ -0,0 +1,92 @@
+import time
+
+import numpy as np
+
+from optimization.backends import SolveResult
+
+# Safety net for the repair loop (each step adds at least one unit)
+MAX_REPAIR_STEPS = 10_000
+TOL = 1e-9
+
+
+def round_and_repair(model, values):
+    """
+    Integer plan near the LP solution `values`, or None if repair fails.
+
+      1. Round down: with non-negative coefficients this keeps every '<='
+         row (and column bound) satisfied.
+      2. Repair: while a '>=' row is short, add one unit of the food with
+         the most shortfall covered per unit cost (shortfalls scaled by
+         their bounds) that keeps every '<=' row and bound satisfied.
+      3. Trim: drop units of the most expensive foods while every '>='
+         row stays satisfied.
+    """
+    A = model.A
+    lower, upper = model.row_lower, model.row_upper
+    col_upper = np.floor(model.col_upper + TOL) if model.col_upper is not None else np.full(model.num_vars, np.inf)
+    cost = np.asarray(model.cost)
+
+    x = np.minimum(np.floor(np.maximum(values, 0) + TOL), col_upper)
+    activity = A @ x
+
+    has_lower = np.isfinite(lower)
+    scale = np.where(has_lower & (np.abs(lower) > TOL), np.abs(lower), 1.0)
+    # Cost floor keeps free foods first in line without dividing by zero
+    unit_cost = np.maximum(cost, 1e-9)
+
+    for _ in range(MAX_REPAIR_STEPS):
+        shortfall = np.where(has_lower, np.maximum(lower - activity, 0), 0)
+        if not np.any(shortfall > TOL):
+            break
+        fits = np.all(activity[:, None] + A <= upper[:, None] + TOL, axis=0) & (x + 1 <= col_upper)
+        covered = (np.minimum(A, shortfall[:, None]) / scale[:, None]).sum(axis=0)
+        score = np.where(fits, covered / unit_cost, 0)
+        j = int(np.argmax(score))
+        if score[j] <= 0:
+            return None
+        x[j] += 1
+        activity += A[:, j]
+    else:
+        return None
+
+    for j in np.argsort(-cost):
+        while x[j] > 0 and cost[j] > 0:
+            trimmed = activity - A[:, j]
+            if np.any(has_lower & (trimmed < lower - TOL)):
+                break
+            x[j] -= 1
+            activity = trimmed
+
+    return x
+
+
+def approximate_solve(model, backend, log_path=None):
+    """
+    LP relaxation of `model` (which must be continuous), then
+    round_and_repair. Returns (SolveResult, lp_bound):
+
+      - 'Optimal' if the rounded plan costs the LP bound (provably optimal)
+      - 'Feasible' with mip_gap = (cost - bound) / cost otherwise
+      - 'Infeasible' if the relaxation is (so is the integer problem)
+      - 'Not Solved' if rounding could not be repaired into a feasible plan
+    """
+    start = time.perf_counter()
+    relaxed = backend.solve(model, log_path=log_path)
+    if relaxed.status != 'Optimal':
+        return SolveResult(relaxed.status, solve_time=time.perf_counter() - start), None
+
+    lp_bound = float(np.asarray(model.cost) @ relaxed.values)
+    x = round_and_repair(model, relaxed.values)
+    if x is None:
+        return SolveResult('Not Solved', solve_time=time.perf_counter() - start), lp_bound
+
+    objective = float(np.asarray(model.cost) @ x)
+    gap = (objective - lp_bound) / abs(objective) if abs(objective) > TOL else 0.0
+    gap = max(gap, 0.0)
+    return SolveResult(
+        'Optimal' if gap <= 1e-9 else 'Feasible',
+        objective_value=objective,
+        values=x,
+        solve_time=time.perf_counter() - start,
+        mip_gap=gap,
+    ), lp_bound
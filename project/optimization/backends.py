@@ -0,0 +1,301 @@
+import logging
+import os
+import threading
+import time
+
+import numpy as np
+import pulp
+
+from optimization.model import to_pulp
+
+try:
+    import highspy
+except ImportError:  # optional: in-process backend
+    highspy = None
+
+logger = logging.getLogger(__name__)
+
+# Environment variable used to pick the default backend
+SOLVER_ENV_VAR = 'NUTRITION_SOLVER'
+
+
+class SolveResult:
+    """
+    Backend-neutral outcome of a solve.
+      - status:          PuLP-style status string ('Optimal', 'Infeasible', ...),
+                         or 'Feasible' when a time limit / cancel stopped the
+                         search with an incumbent in hand
+      - objective_value: total cost, or None if no solution
+      - values:          quantity per catalog food (np.ndarray), or None
+      - solve_time:      wall time spent inside the backend, in seconds
+      - mip_gap:         relative gap of the returned solution, if known
+    """
+
+    def __init__(self, status, objective_value=None, values=None, solve_time=0.0, mip_gap=None):
+        self.status = status
+        self.objective_value = objective_value
+        self.values = values
+        self.solve_time = solve_time
+        self.mip_gap = mip_gap
+
+
+class SolverBackend:
+    """
+    Base class for solver backends. Subclasses turn a NutritionModel into a
+    SolveResult. Optional arguments:
+      - time_limit:   seconds before the search stops
+      - gap:          relative MIP gap at which a solution counts as optimal
+      - on_incumbent: called as on_incumbent(objective, values, bound) for
+                      every improved solution found during the search
+      - should_stop:  polled during the search; returning True cancels it
+      - log_path:     write the solver's own log to this file (debug mode)
+    Backends that cannot report incumbents or stop mid-search ignore the
+    last two (should_stop is still honoured before the solve starts).
+    """
+
+    name = None
+
+    @classmethod
+    def available(cls):
+        return True
+
+    def solve(self, model, time_limit=None, gap=None, on_incumbent=None, should_stop=None, log_path=None):
+        raise NotImplementedError
+
+
+class CbcBackend(SolverBackend):
+    """
+    PuLP + CBC command line: writes an MPS file and spawns the CBC binary
+    for every solve. Always available (CBC ships with PuLP).
+    """
+
+    name = 'cbc'
+
+    def solve(self, model, time_limit=None, gap=None, on_incumbent=None, should_stop=None, log_path=None):
+        start = time.perf_counter()
+        if should_stop is not None and should_stop():
+            return SolveResult('Not Solved')
+
+        problem, x = to_pulp(model)
+
+        solver = pulp.PULP_CBC_CMD(msg=0, timeLimit=time_limit, gapRel=gap, logPath=log_path)
+        problem.solve(solver)
+        return pulp_result(problem, x, start)
+
+
+def pulp_result(problem, x, start):
+    """
+    SolveResult of a PuLP problem just solved by CBC; `x` are its variables
+    in column order and `start` the perf_counter() time the solve began.
+    """
+    status = pulp.LpStatus[problem.status]
+    if status != 'Optimal':
+        return SolveResult(status, solve_time=time.perf_counter() - start)
+    if problem.sol_status == pulp.LpSolutionIntegerFeasible:
+        # Stopped by the time limit with an incumbent
+        status = 'Feasible'
+
+    values = np.array([v.varValue or 0 for v in x], dtype=np.float64)
+    return SolveResult(
+        status,
+        objective_value=pulp.value(problem.objective),
+        values=values,
+        solve_time=time.perf_counter() - start,
+        # CBC does not report the gap of an early-stopped solution
+        mip_gap=0.0 if status == 'Optimal' else None,
+    )
+
+
+class HighsBackend(SolverBackend):
+    """
+    In-process HiGHS via highspy. The model is passed to HiGHS as arrays
+    straight from the nutrient matrix: no PuLP objects, no temp files and no
+    subprocess. One Highs instance is kept per thread and reused.
+    """
+
+    name = 'highs'
+
+    def __init__(self):
+        self._local = threading.local()
+
+    @classmethod
+    def available(cls):
+        return highspy is not None
+
+    def _highs(self):
+        h = getattr(self._local, 'highs', None)
+        if h is None:
+            h = highspy.Highs()
+            h.setOptionValue('output_flag', False)
+            self._local.highs = h
+        return h
+
+    @staticmethod
+    def to_highs_lp(model):
+        """
+        Column-wise HighsLp for a NutritionModel.
+        """
+        n = model.num_vars
+        lp = highspy.HighsLp()
+        lp.num_col_ = n
+        lp.num_row_ = model.num_rows
+        lp.col_cost_ = model.cost
+        lp.col_lower_ = np.zeros(n)
+        if model.col_upper is None:
+            lp.col_upper_ = np.full(n, highspy.kHighsInf)
+        else:
+            lp.col_upper_ = np.where(np.isinf(model.col_upper), highspy.kHighsInf, model.col_upper)
+        lp.row_lower_, lp.row_upper_ = HighsBackend.row_bounds(model.row_lower, model.row_upper)
+
+        # Non-zeros of A, column by column
+        At = model.A.T
+        nz = At != 0
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kColwise
+        lp.a_matrix_.num_col_ = n
+        lp.a_matrix_.num_row_ = model.num_rows
+        lp.a_matrix_.start_ = np.concatenate(([0], np.cumsum(nz.sum(axis=1)))).astype(np.int32)
+        lp.a_matrix_.index_ = np.nonzero(nz)[1].astype(np.int32)
+        lp.a_matrix_.value_ = At[nz]
+
+        if model.integer:
+            lp.integrality_ = [highspy.HighsVarType.kInteger] * n
+        return lp
+
+    @staticmethod
+    def row_bounds(lower, upper):
+        """
+        Row bounds for HiGHS. HiGHS reads any bound at +-kHighsInf as "no
+        bound", so a +inf lower (or -inf upper) bound would leave the row
+        free; such rows get the bounds (1, 0) instead, which HiGHS reports
+        as infeasible.
+        """
+        inf = highspy.kHighsInf
+        impossible = (lower == np.inf) | (upper == -np.inf)
+        lower = np.where(impossible, 1.0, np.where(lower == -np.inf, -inf, lower))
+        upper = np.where(impossible, 0.0, np.where(upper == np.inf, inf, upper))
+        return lower, upper
+
+    @staticmethod
+    def configure(h, time_limit=None, gap=None, log_path=None, integer=True):
+        h.setOptionValue('time_limit', float(time_limit) if time_limit else highspy.kHighsInf)
+        # Prove optimality like CBC does unless a gap is given
+        h.setOptionValue('mip_rel_gap', float(gap) if gap is not None else 0.0)
+        # LP relaxations (approximate mode) are small after catalog presolve;
+        # HiGHS presolve roughly doubles their solve time
+        h.setOptionValue('presolve', 'choose' if integer else 'off')
+        # Instances are reused, so the log settings are reset on every solve
+        h.setOptionValue('log_to_console', False)
+        h.setOptionValue('log_file', log_path or '')
+        h.setOptionValue('output_flag', bool(log_path))
+
+    def solve(self, model, time_limit=None, gap=None, on_incumbent=None, should_stop=None, log_path=None):
+        start = time.perf_counter()
+        h = self._highs()
+        h.clearModel()
+        self.configure(h, time_limit, gap, log_path, integer=model.integer)
+        h.passModel(self.to_highs_lp(model))
+        self.run(h, on_incumbent, should_stop)
+        return self.result(h, model, start)
+
+    @staticmethod
+    def run(h, on_incumbent=None, should_stop=None):
+        """
+        h.run() with optional incumbent reporting and cancellation.
+        """
+        subscribed = []
+
+        if on_incumbent is not None:
+            def improving(event):
+                out = event.data_out
+                on_incumbent(out.objective_function_value, np.asarray(out.mip_solution), out.mip_dual_bound)
+            h.cbMipImprovingSolution.subscribe(improving)
+            subscribed.append((h.cbMipImprovingSolution, improving))
+
+        if should_stop is not None:
+            def interrupt(event):
+                if should_stop():
+                    event.data_in.user_interrupt = True
+            for hook in (h.cbMipInterrupt, h.cbSimplexInterrupt):
+                hook.subscribe(interrupt)
+                subscribed.append((hook, interrupt))
+
+        try:
+            h.run()
+        finally:
+            for hook, callback in subscribed:
+                hook.unsubscribe(callback)
+
+    @staticmethod
+    def result(h, model, start):
+        status = _HIGHS_STATUS.get(h.getModelStatus(), 'Not Solved')
+        info = h.getInfo()
+        has_solution = info.primal_solution_status == _HIGHS_FEASIBLE
+        if status == 'Not Solved' and has_solution:
+            # Time limit / cancel with an incumbent
+            status = 'Feasible'
+        if status not in ('Optimal', 'Feasible'):
+            return SolveResult(status, solve_time=time.perf_counter() - start)
+
+        values = np.asarray(h.getSolution().col_value, dtype=np.float64)
+        return SolveResult(
+            status,
+            objective_value=info.objective_function_value,
+            values=values,
+            solve_time=time.perf_counter() - start,
+            mip_gap=info.mip_gap if model.integer else 0.0,
+        )
+
+
+if highspy is not None:
+    _HIGHS_STATUS = {
+        highspy.HighsModelStatus.kOptimal: 'Optimal',
+        highspy.HighsModelStatus.kInfeasible: 'Infeasible',
+        highspy.HighsModelStatus.kUnbounded: 'Unbounded',
+        highspy.HighsModelStatus.kUnboundedOrInfeasible: 'Undefined',
+    }
+    # HighsInfo.primal_solution_status value for "feasible solution available"
+    _HIGHS_FEASIBLE = 2
+else:
+    _HIGHS_STATUS = {}
+    _HIGHS_FEASIBLE = None
+
+
+# Registry, in order of preference. CBC comes first: on the real catalog
+# (and on synthetic ones up to a few hundred foods) its per-solve latency
+# beats HiGHS, whose MIP setup dominates these small models (see
+# benchmarks/bench_backends.py). HiGHS is opt-in via $NUTRITION_SOLVER;
+# sessions need it for warm-started re-solves.
+BACKENDS = {
+    CbcBackend.name: CbcBackend,
+    HighsBackend.name: HighsBackend,
+}
+
+_instances = {}
+_instances_lock = threading.Lock()
+
+
+def get_backend(name=None):
+    """
+    Return a (shared) backend instance.
+
+    `name` defaults to $NUTRITION_SOLVER, then to the first available backend
+    in BACKENDS. A backend that is requested but not installed falls back to
+    CBC with a warning.
+    """
+    if isinstance(name, SolverBackend):
+        return name
+
+    name = name or os.environ.get(SOLVER_ENV_VAR)
+    if name is None:
+        name = next(n for n, cls in BACKENDS.items() if cls.available())
+
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown solver backend {name!r}; choose from {sorted(BACKENDS)}")
+    if not BACKENDS[name].available():
+        logger.warning("Solver backend %r is not installed, falling back to CBC", name)
+        name = CbcBackend.name
+
+    with _instances_lock:
+        if name not in _instances:
+            _instances[name] = BACKENDS[name]()
+        return _instances[name]
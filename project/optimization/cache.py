@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+from optimization.model import parse_constraints
+
+
+def canonical_constraints(constraints):
+    """
+    Canonical, hashable form of a constraint dict:
+      - empty / unset fields dropped (same rule the solver uses)
+      - numbers normalized ('5', '5.0' and 5 are the same key)
+      - keys sorted
+    """
+    bounds = parse_constraints(constraints)
+    return tuple(sorted(bounds.items()))
+
+
+class ResultCache:
+    """
+    Thread-safe LRU cache with a per-entry TTL.
+
+    Entries are evicted least-recently-used once `maxsize` is reached and
+    expire `ttl` seconds after insertion (ttl=None disables expiry).
+    Hit / miss / eviction counters are kept for sizing.
+    """
+
+    def __init__(self, maxsize=256, ttl=600):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key):
+        """
+        Return the cached value for `key`, or None on a miss.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                # Stale entry
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        if self.maxsize <= 0:
+            return
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Drop every entry (e.g. when the food catalog changes).
+        """
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
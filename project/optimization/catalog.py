@@ -0,0 +1,150 @@
+import json
+
+import numpy as np
+
+# Non-nutrient keys of a food entry
+META_KEYS = ('cost', 'category')
+
+
+class FoodCatalog:
+    """
+    Precompiled, read-only view of the food data:
+      - names:     food names, in column order of the model
+      - nutrients: nutrient names, in column order of `matrix`
+      - matrix:    dense float64 array (foods x nutrients), missing values are 0
+      - cost:      float64 cost vector (one entry per food)
+      - version:   opaque tag identifying the source data (e.g. file mtime)
+      - categories: optional category per food (None where unknown)
+    Built once at startup so requests never walk the nested foods dict.
+    """
+
+    def __init__(self, names, nutrients, matrix, cost, version=None, categories=None):
+        self.names = list(names)
+        self.nutrients = list(nutrients)
+        self.matrix = np.ascontiguousarray(matrix, dtype=np.float64)
+        self.cost = np.ascontiguousarray(cost, dtype=np.float64)
+        self.version = version
+        self.categories = list(categories) if categories is not None else None
+        self._category_index = None
+
+        self._check_shapes()
+
+        # Name indexes
+        self.index = {name: i for i, name in enumerate(self.names)}
+        self.nutrient_index = {nutrient: j for j, nutrient in enumerate(self.nutrients)}
+
+    def _check_shapes(self):
+        if self.matrix.shape != (len(self.names), len(self.nutrients)):
+            raise ValueError(
+                f"Nutrient matrix has shape {self.matrix.shape}, "
+                f"expected ({len(self.names)}, {len(self.nutrients)})"
+            )
+        if self.cost.shape != (len(self.names),):
+            raise ValueError(f"Cost vector has shape {self.cost.shape}, expected ({len(self.names)},)")
+
+    @classmethod
+    def from_foods_data(cls, foods_data, version=None):
+        """
+        Compile the nested {food: {nutrient: value, 'cost': value}} dict
+        used by data/foods.json. An optional 'category' key per food is kept
+        as the food's category.
+        """
+        names = list(foods_data.keys())
+
+        # Keep nutrients in first-seen order so columns are stable across loads
+        nutrients = {}
+        for values in foods_data.values():
+            for key in values:
+                if key not in META_KEYS:
+                    nutrients.setdefault(key, None)
+        nutrients = list(nutrients)
+
+        matrix = np.array(
+            [[values.get(n, 0) for n in nutrients] for values in foods_data.values()],
+            dtype=np.float64,
+        ).reshape(len(names), len(nutrients))
+        cost = np.array([values['cost'] for values in foods_data.values()], dtype=np.float64)
+
+        categories = [values.get('category') for values in foods_data.values()]
+        if not any(categories):
+            categories = None
+
+        return cls(names, nutrients, matrix, cost, version=version, categories=categories)
+
+    @classmethod
+    def from_json(cls, path, version=None):
+        with open(path, 'r') as f:
+            return cls.from_foods_data(json.load(f), version=version)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __contains__(self, name):
+        return name in self.index
+
+    def column(self, nutrient):
+        """
+        Values of one nutrient for every food (zeros if no food has it).
+        """
+        j = self.nutrient_index.get(nutrient)
+        if j is None:
+            return np.zeros(len(self.names))
+        return self.matrix[:, j]
+
+    def columns(self, nutrients):
+        """
+        Nutrient sub-matrix (foods x len(nutrients)), gathered in one indexing pass.
+        """
+        out = np.zeros((len(self.names), len(nutrients)))
+        known = [(k, self.nutrient_index[n]) for k, n in enumerate(nutrients) if n in self.nutrient_index]
+        if known:
+            dst, src = zip(*known)
+            out[:, list(dst)] = self.matrix[:, list(src)]
+        return out
+
+    def food(self, name):
+        """
+        One food as a {nutrient: value, 'cost': value} dict.
+        """
+        i = self.index[name]
+        values = dict(zip(self.nutrients, self.matrix[i].tolist()))
+        values['cost'] = float(self.cost[i])
+        return values
+
+    def category_indices(self, category):
+        """
+        Row indices of the foods in `category` (empty if unknown).
+        """
+        if self._category_index is None:
+            index = {}
+            for i, c in enumerate(self.categories or ()):
+                if c is not None:
+                    index.setdefault(c, []).append(i)
+            self._category_index = {c: np.array(rows, dtype=np.int64) for c, rows in index.items()}
+        return self._category_index.get(category, np.zeros(0, dtype=np.int64))
+
+    def subset(self, rows):
+        """
+        FoodCatalog of the foods at `rows`, in that order (same version).
+        """
+        rows = np.asarray(rows, dtype=np.int64)
+        categories = self.categories
+        return FoodCatalog(
+            [self.names[i] for i in rows],
+            self.nutrients,
+            self.matrix[rows],
+            self.cost[rows],
+            version=self.version,
+            categories=[categories[i] for i in rows] if categories is not None else None,
+        )
+
+    def totals(self, quantities):
+        """
+        Nutrient totals (and total cost) of a {food: quantity} plan.
+        """
+        idx = [self.index[name] for name in quantities]
+        qty = np.array(list(quantities.values()), dtype=np.float64)
+        sums = qty @ self.matrix[idx] if idx else np.zeros(len(self.nutrients))
+        totals = {n: round(float(v), 6) for n, v in zip(self.nutrients, sums)}
+        totals['cost'] = round(float(qty @ self.cost[idx]), 6) if idx else 0.0
+        return totals
@@ -0,0 +1,97 @@
+import json
+import logging
+import os
+import random
+import threading
+import time
+import uuid
+
+from optimization.model import to_pulp
+
+logger = logging.getLogger(__name__)
+
+# Fraction of solves to dump (0 disables debug mode, 1 dumps every solve)
+DEBUG_SAMPLE_ENV_VAR = 'NUTRITION_DEBUG_SAMPLE'
+# Where dumps go
+DEBUG_DIR_ENV_VAR = 'NUTRITION_DEBUG_DIR'
+DEFAULT_DEBUG_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'debug')
+
+
+class DebugSampler:
+    """
+    Opt-in replacement for writing model.lp / the CBC log on every solve.
+    A sampled solve leaves three files under `directory`, sharing one prefix:
+      - <prefix>.lp:   the model in LP format
+      - <prefix>.log:  the solver's own log
+      - <prefix>.json: constraints, presolve report and solution
+    At most `max_dumps` solves are kept; the oldest are deleted first.
+    """
+
+    def __init__(self, rate=0.0, directory=DEFAULT_DEBUG_DIR, max_dumps=200):
+        if not 0.0 <= rate <= 1.0:
+            raise ValueError(f"Debug sample rate must be within [0, 1], got {rate}")
+        self.rate = rate
+        self.directory = directory
+        self.max_dumps = max_dumps
+        self._lock = threading.Lock()
+        self.dumps = 0
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            rate=float(os.environ.get(DEBUG_SAMPLE_ENV_VAR) or 0.0),
+            directory=os.environ.get(DEBUG_DIR_ENV_VAR) or DEFAULT_DEBUG_DIR,
+        )
+
+    @property
+    def enabled(self):
+        return self.rate > 0
+
+    def sample(self):
+        """
+        Path prefix for this solve's dump files, or None if it is not sampled.
+        """
+        if not self.enabled or random.random() >= self.rate:
+            return None
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime('%Y%m%d-%H%M%S')
+        return os.path.join(self.directory, f"solve-{stamp}-{uuid.uuid4().hex[:8]}")
+
+    def dump(self, prefix, model, constraints, solution, presolve=None):
+        """
+        Write the LP model and a JSON summary next to the solver log.
+        Failures are logged, never raised: debugging must not break a solve.
+        """
+        try:
+            problem, _ = to_pulp(model)
+            problem.writeLP(f"{prefix}.lp")
+            with open(f"{prefix}.json", 'w') as f:
+                json.dump({
+                    "constraints": constraints,
+                    "variables": model.num_vars,
+                    "rows": model.row_names,
+                    "presolve": presolve,
+                    "solution": solution,
+                }, f, indent=2, default=str)
+        except Exception:
+            logger.exception("Could not write debug dump %s", prefix)
+            return
+        with self._lock:
+            self.dumps += 1
+        self._prune()
+
+    def _prune(self):
+        try:
+            names = sorted(n for n in os.listdir(self.directory) if n.startswith('solve-') and n.endswith('.json'))
+        except OSError:
+            return
+        for name in names[:max(0, len(names) - self.max_dumps)]:
+            stem = os.path.join(self.directory, name[:-len('.json')])
+            for ext in ('.json', '.lp', '.log'):
+                try:
+                    os.remove(stem + ext)
+                except OSError:
+                    pass
+
+
+debug_sampler = DebugSampler.from_env()
@@ -1,6 +1,32 @@
-import pulp
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-def optimize_nutrition(constraints, foods_data):
+import numpy as np
+
+from optimization.approx import approximate_solve
+from optimization.backends import get_backend
+from optimization.catalog import FoodCatalog
+from optimization.debug import debug_sampler
+from optimization.metrics import PHASE_SECONDS, PRESOLVE_REMOVED, SOLVES, observe_solve
+from optimization.model import build_model
+from optimization.presolve import presolved_model
+
+# Solve modes: 'exact' proves optimality (within `gap`, if given);
+# 'approximate' rounds the LP relaxation and reports its gap to the LP bound
+MODES = ('exact', 'approximate')
+
+
+def as_catalog(foods_data):
+    """
+    Accept either a precompiled FoodCatalog or the raw foods dict.
+    """
+    if isinstance(foods_data, FoodCatalog):
+        return foods_data
+    return FoodCatalog.from_foods_data(foods_data)
+
+
+def optimize_nutrition(constraints, foods_data, backend=None, presolve=True, mode='exact',
+                       time_limit=None, gap=None):
     """
     ILP that:
       - Minimizes total cost
@@ -11,83 +37,175 @@ def optimize_nutrition(constraints, foods_data):
         * min_fiber
         * max_sugars
         * min_vitamin_c
+
+    `foods_data` should be a FoodCatalog built once at startup; a raw foods
+    dict is still accepted but gets compiled on every call.
+
+    `backend` is a backend name ('highs', 'cbc') or SolverBackend instance;
+    see optimization.backends.get_backend for the default.
+
+    With `presolve` the model only contains foods that are not dominated
+    under the active constraints, with upper bounds from the max_*
+    constraints (see optimization.presolve); the solution then carries a
+    "presolve" report. The optimal cost is the same either way.
+
+    Phase timings, solver status and model size go to optimization.metrics.
+    A sampled fraction of solves (see optimization.debug) also leaves the
+    LP model, solver log and solution on disk.
+
+    `mode` (see MODES):
+      - 'exact': integer solve; `time_limit` (seconds) and `gap` (relative
+        MIP gap) stop it early, in which case the answer is 'Feasible' with
+        its 'gap' (a requested gap is also reported on 'Optimal' answers)
+      - 'approximate': LP relaxation, rounding and greedy repair (see
+        optimization.approx) for live previews; adds 'lp_bound' and 'gap'.
+        'Optimal' only when the rounded plan meets the LP bound.
+    Every solution says which "mode" produced it.
     """
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; choose from {MODES}")
+    catalog = as_catalog(foods_data)
+    backend = get_backend(backend)
+    integer = mode == 'exact'
+
+    # Build the matrix model and solve it
+    with PHASE_SECONDS.time(phase='build'):
+        if presolve:
+            model, report = presolved_model(constraints, catalog, integer=integer)
+        else:
+            model, report = build_model(constraints, catalog, integer=integer), None
+    if report is not None:
+        PRESOLVE_REMOVED.inc(report["removed"])
+
+    debug_prefix = debug_sampler.sample()
+    log_path = debug_prefix and f"{debug_prefix}.log"
+    start = time.perf_counter()
+    if integer:
+        result = backend.solve(model, time_limit=time_limit, gap=gap, log_path=log_path)
+        lp_bound = None
+    else:
+        result, lp_bound = approximate_solve(model, backend, log_path=log_path)
+    observe_solve(model, result, backend, time.perf_counter() - start)
+
+    with PHASE_SECONDS.time(phase='extract'):
+        solution = extract_solution(result, model.catalog)
+    solution["mode"] = mode
+    if not integer:
+        solution["lp_bound"] = lp_bound
+        solution["gap"] = result.mip_gap
+    elif gap is not None and result.status == 'Optimal':
+        solution["gap"] = result.mip_gap
+    if report is not None:
+        solution["presolve"] = report
+
+    if debug_prefix:
+        debug_sampler.dump(debug_prefix, model, constraints, solution, presolve=report)
+    return solution
 
-    # Create the problem
-    problem = pulp.LpProblem("Nutrition_Optimization", pulp.LpMinimize)
-
-    # Define decision variables
-    food_items = list(foods_data.keys())
-    x = pulp.LpVariable.dicts('quantity', food_items, lowBound=0, cat=pulp.LpInteger)
-    # If you want fractional amounts, use cat=pulp.LpContinuous
-
-    # Objective: minimize total cost
-    problem += pulp.lpSum([foods_data[f]['cost'] * x[f] for f in food_items]), "Total_Cost"
-
-    # ---------- CALORIES (min / max) ----------
-    if 'min_calories' in constraints and constraints['min_calories']:
-        min_cal = float(constraints['min_calories'])
-        problem += (
-            pulp.lpSum([foods_data[f]['calories'] * x[f] for f in food_items])
-            >= min_cal
-        ), "MinCalories"
-
-    if 'max_calories' in constraints and constraints['max_calories']:
-        max_cal = float(constraints['max_calories'])
-        problem += (
-            pulp.lpSum([foods_data[f]['calories'] * x[f] for f in food_items])
-            <= max_cal
-        ), "MaxCalories"
-
-    # ---------- PROTEIN (min) ----------
-    if 'min_protein' in constraints and constraints['min_protein']:
-        min_prot = float(constraints['min_protein'])
-        problem += (
-            pulp.lpSum([foods_data[f].get('protein', 0) * x[f] for f in food_items])
-            >= min_prot
-        ), "MinProtein"
-
-    # ---------- FIBER (min) ----------
-    if 'min_fiber' in constraints and constraints['min_fiber']:
-        min_fiber = float(constraints['min_fiber'])
-        problem += (
-            pulp.lpSum([foods_data[f].get('fiber', 0) * x[f] for f in food_items])
-            >= min_fiber
-        ), "MinFiber"
-
-    # ---------- SUGARS (max) ----------
-    if 'max_sugars' in constraints and constraints['max_sugars']:
-        max_sugars = float(constraints['max_sugars'])
-        problem += (
-            pulp.lpSum([foods_data[f].get('sugars', 0) * x[f] for f in food_items])
-            <= max_sugars
-        ), "MaxSugars"
-
-    # ---------- VITAMIN C (min) ----------
-    if 'min_vitamin_c' in constraints and constraints['min_vitamin_c']:
-        min_vit_c = float(constraints['min_vitamin_c'])
-        problem += (
-            pulp.lpSum([foods_data[f].get('vitamin_c', 0) * x[f] for f in food_items])
-            >= min_vit_c
-        ), "MinVitaminC"
-
-    # Solve the problem
-    solver = pulp.PULP_CBC_CMD(msg=0)
-    problem.solve(solver)
-
-    # Prepare the result
-    status = pulp.LpStatus[problem.status]
+
+def extract_solution(result, catalog):
+    """
+    Turn a backend SolveResult into the solution dict returned to callers.
+    A 'Feasible' result (search stopped early) also carries its 'gap'.
+    """
+    status = result.status
     solution = {
         "status": status,
-        "objective_value": pulp.value(problem.objective) if status == 'Optimal' else None,
+        "objective_value": None,
         "quantities": {}
     }
 
-    if status == 'Optimal':
+    if status in ('Optimal', 'Feasible'):
         # Extract chosen quantities
-        for f in food_items:
-            qty = x[f].varValue
-            if qty > 0:
-                solution["quantities"][f] = int(qty)
+        solution["quantities"] = quantities_from_values(result.values, catalog)
+        solution["objective_value"] = plan_cost(solution["quantities"], catalog)
+
+    if status == 'Feasible':
+        solution["gap"] = result.mip_gap
 
     return solution
+
+
+def quantities_from_values(values, catalog):
+    """
+    {food: integer quantity} for the foods with a non-zero value.
+    """
+    return {
+        catalog.names[j]: int(round(values[j]))
+        for j in np.flatnonzero(np.rint(values) > 0)
+    }
+
+
+def plan_cost(quantities, catalog):
+    """
+    Re-price rounded quantities so every backend (and mode) reports the
+    same cost; rounded so summation order doesn't show in the last digit.
+    """
+    return round(sum(
+        (float(catalog.cost[catalog.index[f]]) * q for f, q in quantities.items()),
+        0.0,
+    ), 9)
+
+
+# ---------- BATCH ----------
+
+# Per-process state of batch workers, set once by _init_batch_worker
+_worker_catalog = None
+_worker_backend = None
+
+
+def _init_batch_worker(catalog, backend_name):
+    """
+    Pool initializer: the catalog arrives once per worker process (inherited
+    on fork, pickled once on spawn) instead of once per task.
+    """
+    global _worker_catalog, _worker_backend
+    _worker_catalog = catalog
+    _worker_backend = backend_name
+
+
+def _solve_batch_item(constraints):
+    try:
+        return optimize_nutrition(constraints, _worker_catalog, backend=_worker_backend)
+    except Exception as exc:
+        return {"status": "Error", "error": f"{type(exc).__name__}: {exc}"}
+
+
+def optimize_batch(constraint_sets, foods_data, max_workers=None, backend=None):
+    """
+    Solve many constraint sets across a process pool.
+
+    Yields one dict per input as soon as it finishes (completion order, not
+    input order): {"index": <position in constraint_sets>, **solution}.
+    A failing item yields {"index": i, "status": "Error", "error": "..."}
+    without affecting the others.
+
+    Statuses are counted in this process's metrics (worker processes keep
+    their own, unexposed registries). Closing the generator early (e.g. a
+    streaming client went away) cancels the items not started yet.
+    """
+    catalog = as_catalog(foods_data)
+    backend_name = get_backend(backend).name
+
+    pool = ProcessPoolExecutor(
+        max_workers=max_workers,
+        initializer=_init_batch_worker,
+        initargs=(catalog, backend_name),
+    )
+    try:
+        futures = {
+            pool.submit(_solve_batch_item, constraints): i
+            for i, constraints in enumerate(constraint_sets)
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                solution = future.result()
+            except Exception as exc:
+                # e.g. a worker process died
+                solution = {"status": "Error", "error": f"{type(exc).__name__}: {exc}"}
+            SOLVES.inc(backend=backend_name, status=solution["status"])
+            yield {"index": index, **solution}
+    finally:
+        # Only waits for the items already running
+        pool.shutdown(cancel_futures=True)
@@ -0,0 +1,231 @@
+import math
+import threading
+import time
+import uuid
+from collections import deque
+
+from optimization.backends import get_backend
+from optimization.ilp_solver import extract_solution, plan_cost, quantities_from_values
+from optimization.metrics import observe_solve
+from optimization.model import parse_constraints
+from optimization.presolve import presolved_model
+
+
+class JobQueueFull(Exception):
+    """
+    Raised by JobManager.submit when the queue is at capacity.
+    """
+
+
+class Job:
+    """
+    One asynchronous solve. State goes queued -> running -> one of
+    done / failed / cancelled. Every change bumps `version` and wakes
+    anyone blocked in wait_for_change (used for SSE streaming).
+    """
+
+    QUEUED = 'queued'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    CANCELLED = 'cancelled'
+    TERMINAL = (DONE, FAILED, CANCELLED)
+
+    def __init__(self, constraints, time_limit=None, gap=None):
+        self.id = uuid.uuid4().hex
+        self.constraints = constraints
+        self.time_limit = time_limit
+        self.gap = gap
+
+        self.state = Job.QUEUED
+        self.result = None
+        self.error = None
+        self.incumbents = []
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+        self.version = 0
+        self._cancel = threading.Event()
+        self._changed = threading.Condition()
+
+    @property
+    def done(self):
+        return self.state in Job.TERMINAL
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def _update(self, **fields):
+        with self._changed:
+            for name, value in fields.items():
+                setattr(self, name, value)
+            self.version += 1
+            self._changed.notify_all()
+
+    def _add_incumbent(self, incumbent):
+        with self._changed:
+            self.incumbents.append(incumbent)
+            self.version += 1
+            self._changed.notify_all()
+
+    def wait_for_change(self, since_version, timeout=None):
+        """
+        Block until `version` differs from `since_version` (or timeout).
+        Returns the current version.
+        """
+        with self._changed:
+            self._changed.wait_for(lambda: self.version != since_version, timeout=timeout)
+            return self.version
+
+    def to_dict(self):
+        with self._changed:
+            return {
+                "id": self.id,
+                "state": self.state,
+                "constraints": self.constraints,
+                "time_limit": self.time_limit,
+                "gap": self.gap,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "finished_at": self.finished_at,
+                "incumbents": list(self.incumbents),
+                "result": self.result,
+                "error": self.error,
+            }
+
+
+class JobManager:
+    """
+    Runs solve jobs on a fixed number of worker threads fed by a bounded
+    queue, so long solves never occupy request threads.
+
+      - max_workers:     solver threads
+      - max_queue:       queued (not yet running) jobs before submit() refuses;
+                         a job cancelled while queued leaves the queue
+      - max_time_limit:  cap on (and default for) each job's time limit
+      - retain:          seconds a finished job stays queryable
+    `catalog_fn` returns the catalog to solve against (read when a job starts).
+    """
+
+    def __init__(self, catalog_fn, backend=None, max_workers=2, max_queue=32, max_time_limit=120, retain=600):
+        self.catalog_fn = catalog_fn
+        self.backend = get_backend(backend)
+        self.max_time_limit = max_time_limit
+        self.max_queue = max_queue
+        self.retain = retain
+
+        self._queue = deque()
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._queued = threading.Condition(self._lock)
+        self._workers = [
+            threading.Thread(target=self._work, name=f"solve-job-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, constraints, time_limit=None, gap=None):
+        """
+        Queue a solve and return its Job. Raises JobQueueFull under backpressure,
+        ValueError if a constraint is not a number or `gap` is outside [0, 1).
+        """
+        parse_constraints(constraints)
+        if gap is not None and not 0 <= gap < 1:
+            raise ValueError("gap must be in [0, 1)")
+        if time_limit is None or not 0 < time_limit <= self.max_time_limit:
+            time_limit = self.max_time_limit
+        job = Job(constraints, time_limit=time_limit, gap=gap)
+
+        self._prune()
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                raise JobQueueFull(f"Job queue is full ({self.max_queue} waiting)")
+            self._queue.append(job)
+            self._jobs[job.id] = job
+            self._queued.notify()
+        return job
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """
+        Request cancellation. A queued job is cancelled immediately; a running
+        one stops at the solver's next interrupt check and keeps its best
+        incumbent. Returns the Job, or None if unknown.
+        """
+        job = self.get(job_id)
+        if job is None:
+            return None
+        job._cancel.set()
+        with job._changed:
+            if job.state == Job.QUEUED:
+                job._update(state=Job.CANCELLED, finished_at=time.time())
+                with self._lock:
+                    if job in self._queue:
+                        self._queue.remove(job)
+        return job
+
+    def stats(self):
+        with self._lock:
+            states = {}
+            for job in self._jobs.values():
+                states[job.state] = states.get(job.state, 0) + 1
+            queued = len(self._queue)
+        return {
+            "workers": len(self._workers),
+            "queued": queued,
+            "queue_capacity": self.max_queue,
+            "jobs": states,
+        }
+
+    def _prune(self):
+        cutoff = time.time() - self.retain
+        with self._lock:
+            for job_id in [j.id for j in self._jobs.values() if j.done and j.finished_at < cutoff]:
+                del self._jobs[job_id]
+
+    def _work(self):
+        while True:
+            with self._queued:
+                self._queued.wait_for(lambda: self._queue)
+                job = self._queue.popleft()
+            self._run(job)
+
+    def _run(self, job):
+        with job._changed:
+            if job.done:
+                # Cancelled while queued
+                return
+            job._update(state=Job.RUNNING, started_at=time.time())
+        try:
+            model, _ = presolved_model(job.constraints, self.catalog_fn())
+            catalog = model.catalog
+
+            def on_incumbent(objective, values, bound):
+                quantities = quantities_from_values(values, catalog)
+                job._add_incumbent({
+                    "elapsed": time.time() - job.started_at,
+                    "objective_value": plan_cost(quantities, catalog),
+                    "bound": bound if math.isfinite(bound) else None,
+                    "quantities": quantities,
+                })
+
+            start = time.perf_counter()
+            result = self.backend.solve(
+                model,
+                time_limit=job.time_limit,
+                gap=job.gap,
+                on_incumbent=on_incumbent,
+                should_stop=job._cancel.is_set,
+            )
+            observe_solve(model, result, self.backend, time.perf_counter() - start)
+            solution = extract_solution(result, catalog)
+            state = Job.CANCELLED if job.cancel_requested else Job.DONE
+            job._update(state=state, result=solution, finished_at=time.time())
+        except Exception as exc:
+            job._update(state=Job.FAILED, error=f"{type(exc).__name__}: {exc}", finished_at=time.time())
@@ -0,0 +1,208 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+# Latency buckets in seconds (sub-millisecond parse up to multi-second solves)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+# Model size buckets (variables / constraints)
+SIZE_BUCKETS = (1, 5, 10, 30, 100, 300, 1000, 3000, 10000, 30000, 100000, 300000)
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Metric:
+    """
+    Base class: a named family of series, one per label-value tuple.
+    """
+
+    type = None
+
+    def __init__(self, name, help, labelnames=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} takes labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"]
+        with self._lock:
+            series = sorted(self._series.items())
+        for key, value in series:
+            lines.extend(self._samples(key, value))
+        return lines
+
+
+class Counter(Metric):
+    type = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._series[key] = self._series.get(key, 0) + amount
+
+    def _samples(self, key, value):
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"]
+
+
+class Histogram(Metric):
+    type = 'histogram'
+
+    def __init__(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                # [per-bucket counts (last one is +Inf), sum]
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][bisect.bisect_left(self.buckets, value)] += 1
+            series[1] += value
+
+    @contextmanager
+    def time(self, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self, key, value):
+        counts, total = value
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            labels = _format_labels(self.labelnames, key, [('le', _format_value(float(bound)))])
+            lines.append(f"{self.name}_bucket{labels} {cumulative}")
+        labels = _format_labels(self.labelnames, key)
+        lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+        lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    """
+    Metrics of this process, rendered in the Prometheus text format.
+
+    Besides metrics owned by the registry, collectors registered with
+    add_collector() are called at scrape time and return
+    [(name, type, help, [(labels_dict, value), ...]), ...]; they report
+    state kept elsewhere (e.g. cache counters) without double bookkeeping.
+    """
+
+    def __init__(self):
+        self._metrics = []
+        self._collectors = []
+
+    def register(self, metric):
+        self._metrics.append(metric)
+        return metric
+
+    def counter(self, name, help, labelnames=()):
+        return self.register(Counter(name, help, labelnames))
+
+    def histogram(self, name, help, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector):
+        self._collectors.append(collector)
+
+    def expose(self):
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.expose())
+        for collector in self._collectors:
+            for name, type_, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {type_}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(list(labels), list(labels.values()))} "
+                                 f"{_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+PHASE_SECONDS = REGISTRY.histogram(
+    'nutrition_phase_seconds',
+    "Time spent per phase: parse, build (presolve + model), solve, extract, render, chart.",
+    labelnames=('phase',),
+)
+REQUEST_SECONDS = REGISTRY.histogram(
+    'nutrition_request_seconds',
+    "HTTP request latency by endpoint.",
+    labelnames=('endpoint', 'method'),
+)
+SOLVES = REGISTRY.counter(
+    'nutrition_solves_total',
+    "Solves by backend and solver status.",
+    labelnames=('backend', 'status'),
+)
+MODEL_VARIABLES = REGISTRY.histogram(
+    'nutrition_model_variables',
+    "Variables (foods) per solved model, after presolve.",
+    buckets=SIZE_BUCKETS,
+)
+MODEL_CONSTRAINTS = REGISTRY.histogram(
+    'nutrition_model_constraints',
+    "Constraint rows per solved model.",
+    buckets=SIZE_BUCKETS,
+)
+PRESOLVE_REMOVED = REGISTRY.counter(
+    'nutrition_presolve_removed_foods_total',
+    "Foods removed by presolve before solving.",
+)
+
+
+def observe_solve(model, result, backend, seconds):
+    """
+    Record one backend solve: its wall time, status and model size.
+    """
+    PHASE_SECONDS.observe(seconds, phase='solve')
+    SOLVES.inc(backend=backend.name, status=result.status)
+    MODEL_VARIABLES.observe(model.num_vars)
+    MODEL_CONSTRAINTS.observe(model.num_rows)
+
+
+def cache_collector(caches):
+    """
+    Collector reporting the stats() of named caches ({name: cache}) as
+    nutrition_cache_* series labelled by cache.
+    """
+    counters = ('hits', 'misses', 'evictions', 'expirations', 'invalidations')
+
+    def collect():
+        stats = {name: cache.stats() for name, cache in caches.items()}
+        families = []
+        for counter in counters:
+            samples = [({'cache': name}, s[counter]) for name, s in stats.items() if counter in s]
+            if samples:
+                families.append((f'nutrition_cache_{counter}_total', 'counter', f"Cache {counter}.", samples))
+        sizes = [({'cache': name}, s['size']) for name, s in stats.items() if 'size' in s]
+        if sizes:
+            families.append(('nutrition_cache_entries', 'gauge', "Entries currently cached.", sizes))
+        return families
+
+    return collect
@@ -0,0 +1,142 @@
+import math
+
+import numpy as np
+import pulp
+
+# Form field -> (nutrient, sense, constraint name)
+CONSTRAINT_FIELDS = {
+    'min_calories':  ('calories',  '>=', 'MinCalories'),
+    'max_calories':  ('calories',  '<=', 'MaxCalories'),
+    'min_protein':   ('protein',   '>=', 'MinProtein'),
+    'min_fiber':     ('fiber',     '>=', 'MinFiber'),
+    'max_sugars':    ('sugars',    '<=', 'MaxSugars'),
+    'min_vitamin_c': ('vitamin_c', '>=', 'MinVitaminC'),
+}
+
+
+def parse_constraints(constraints):
+    """
+    Turn the raw constraint dict (form strings, possibly empty) into
+    {field: float} for the fields that are set. Unknown fields are ignored.
+    Raises ValueError when a set field is not a finite number.
+    """
+    bounds = {}
+    for field in CONSTRAINT_FIELDS:
+        value = constraints.get(field)
+        if not value:
+            continue
+        try:
+            bounds[field] = float(value)
+        except (TypeError, ValueError, OverflowError):
+            bounds[field] = math.nan
+        # inf would drop or void the row, nan would unset it (and never
+        # match its own cache key)
+        if not math.isfinite(bounds[field]):
+            raise ValueError(f"{field} must be a number, got {value!r}")
+    return bounds
+
+
+class NutritionModel:
+    """
+    Matrix form of the diet ILP:
+
+        minimize    cost @ x
+        subject to  row_lower <= A @ x <= row_upper
+                    0 <= x <= col_upper, integer
+
+    One row per active constraint field; A is (rows x foods).
+    col_upper is None when no food has an upper bound.
+    """
+
+    def __init__(self, catalog, fields, A, row_lower, row_upper, integer=True, col_upper=None):
+        self.catalog = catalog
+        self.fields = list(fields)
+        self.A = A
+        self.row_lower = row_lower
+        self.row_upper = row_upper
+        self.integer = integer
+        self.col_upper = col_upper
+
+    @property
+    def cost(self):
+        return self.catalog.cost
+
+    @property
+    def row_names(self):
+        return [CONSTRAINT_FIELDS[f][2] for f in self.fields]
+
+    @property
+    def num_vars(self):
+        return len(self.catalog)
+
+    @property
+    def num_rows(self):
+        return len(self.fields)
+
+
+def build_model(constraints, catalog, integer=True, all_fields=False):
+    """
+    Build the model for `constraints` from a FoodCatalog. All constraint rows
+    are gathered from the nutrient matrix in a single indexing pass.
+
+    With all_fields=True there is one row per CONSTRAINT_FIELDS entry, in
+    that order, and unset fields become free rows (-inf, inf). The matrix
+    then never changes between constraint sets, only the row bounds do.
+    """
+    bounds = parse_constraints(constraints)
+    fields = list(CONSTRAINT_FIELDS) if all_fields else list(bounds)
+
+    nutrients = [CONSTRAINT_FIELDS[f][0] for f in fields]
+    A = np.ascontiguousarray(catalog.columns(nutrients).T)
+
+    row_lower, row_upper = row_bounds(bounds, fields)
+    return NutritionModel(catalog, fields, A, row_lower, row_upper, integer=integer)
+
+
+def row_bounds(bounds, fields):
+    """
+    (row_lower, row_upper) arrays for `fields` given parsed {field: value}
+    bounds; fields without a bound are free rows.
+    """
+    rhs = np.array([bounds.get(f, np.nan) for f in fields], dtype=np.float64)
+    is_min = np.array([CONSTRAINT_FIELDS[f][1] == '>=' for f in fields], dtype=bool)
+    is_set = ~np.isnan(rhs)
+    row_lower = np.where(is_min & is_set, rhs, -np.inf)
+    row_upper = np.where(~is_min & is_set, rhs, np.inf)
+    return row_lower, row_upper
+
+
+def to_pulp(model):
+    """
+    Translate a NutritionModel into a PuLP problem.
+    Returns (problem, variables) with variables in catalog order.
+    """
+    problem = pulp.LpProblem("Nutrition_Optimization", pulp.LpMinimize)
+
+    cat = pulp.LpInteger if model.integer else pulp.LpContinuous
+    upper = model.col_upper if model.col_upper is not None else np.full(model.num_vars, np.inf)
+    x = [
+        pulp.LpVariable(f"quantity_{name}", lowBound=0, upBound=None if np.isinf(ub) else float(ub), cat=cat)
+        for name, ub in zip(model.catalog.names, upper)
+    ]
+
+    def affine(coefs):
+        # Only emit non-zero terms
+        nz = np.flatnonzero(coefs)
+        return pulp.LpAffineExpression(zip([x[j] for j in nz], coefs[nz].tolist()))
+
+    # Objective: minimize total cost
+    problem += affine(model.cost), "Total_Cost"
+
+    for k, field in enumerate(model.fields):
+        _, sense, name = CONSTRAINT_FIELDS[field]
+        if np.isinf(model.row_lower[k]) and np.isinf(model.row_upper[k]):
+            # Free row (unset field in an all_fields model)
+            continue
+        if sense == '>=':
+            constraint = pulp.LpConstraint(affine(model.A[k]), pulp.LpConstraintGE, rhs=float(model.row_lower[k]))
+        else:
+            constraint = pulp.LpConstraint(affine(model.A[k]), pulp.LpConstraintLE, rhs=float(model.row_upper[k]))
+        problem += constraint, name
+
+    return problem, x
@@ -0,0 +1,179 @@
+import logging
+import math
+import threading
+import time
+
+from optimization.cache import canonical_constraints
+from optimization.ilp_solver import optimize_batch
+
+logger = logging.getLogger(__name__)
+
+# Profiles the form's body-weight defaults are computed from
+# (templates/index.html); 'default' is what the form fills in
+PRESET_PROFILES = {
+    'default': {
+        'kcal_per_kg': (30, 40),        # min / max calories
+        'protein_per_kg': 1.6,
+        'fiber_per_1000_kcal': 14,
+        'max_sugars': 50,
+        'min_vitamin_c': 75,            # adult female
+    },
+    'vitamin_c_90': {
+        'kcal_per_kg': (30, 40),
+        'protein_per_kg': 1.6,
+        'fiber_per_1000_kcal': 14,
+        'max_sugars': 50,
+        'min_vitamin_c': 90,            # adult male
+    },
+}
+
+# Body weights (kg) precomputed per profile
+DEFAULT_WEIGHTS = tuple(range(40, 151))
+
+
+def js_round(value):
+    """
+    JavaScript's Math.round (halves round up, unlike Python's round).
+    """
+    return math.floor(value + 0.5)
+
+
+def preset_constraints(weight, profile):
+    """
+    The constraint dict the form auto-fills for `weight` under `profile`
+    (a PRESET_PROFILES entry), computed exactly like updateDefaults().
+    """
+    min_kcal, max_kcal = profile['kcal_per_kg']
+    min_calories = js_round(weight * min_kcal)
+    return {
+        'min_calories': str(min_calories),
+        'max_calories': str(js_round(weight * max_kcal)),
+        'min_protein': str(js_round(weight * profile['protein_per_kg'])),
+        'min_fiber': str(js_round(profile['fiber_per_1000_kcal'] * min_calories / 1000)),
+        'max_sugars': str(profile['max_sugars']),
+        'min_vitamin_c': str(profile['min_vitamin_c']),
+    }
+
+
+class PresetTable:
+    """
+    Precomputed exact solutions of the preset constraint sets (every
+    weight in `weights` under every profile), indexed by canonical
+    constraints so a request that matches a preset is answered without
+    solving.
+
+    The table belongs to one catalog version: get() misses for any other
+    catalog. rebuild_async(catalog) (subscribed to CatalogStore reloads)
+    solves the presets on the batch process pool in a background thread
+    and swaps the new table in when it is complete; until then requests
+    are solved as usual. Reloads arriving mid-build are coalesced into one
+    more build for the newest catalog.
+    """
+
+    def __init__(self, weights=DEFAULT_WEIGHTS, profiles=None, backend=None, max_workers=None):
+        self.weights = tuple(weights)
+        self.profiles = PRESET_PROFILES if profiles is None else profiles
+        self.backend = backend
+        self.max_workers = max_workers
+        self._lock = threading.Lock()
+        self._version = None
+        self._solutions = {}
+        self._pending = None
+        self._building = False
+        self._idle = threading.Event()
+        self._idle.set()
+        self.builds = 0
+        self.build_time = None
+        self.hits = 0
+        self.misses = 0
+
+    def constraint_sets(self):
+        """
+        Distinct preset constraint sets (weights x profiles).
+        """
+        sets = {}
+        for profile in self.profiles.values():
+            for weight in self.weights:
+                constraints = preset_constraints(weight, profile)
+                sets.setdefault(canonical_constraints(constraints), constraints)
+        return list(sets.values())
+
+    def get(self, catalog, constraints):
+        """
+        The precomputed solution for `constraints` (a copy, marked "preset"),
+        or None if they are not a preset or the table is for another catalog.
+        """
+        key = canonical_constraints(constraints)
+        with self._lock:
+            solution = self._solutions.get(key) if self._version == catalog.version else None
+            if solution is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return {**solution, "preset": True}
+
+    def build(self, catalog):
+        """
+        Solve every preset against `catalog` and swap the table in.
+        Failed items are left out (those requests are solved as usual).
+        """
+        if not self.weights or not self.profiles:
+            return
+        start = time.perf_counter()
+        constraint_sets = self.constraint_sets()
+        solutions = {}
+        for item in optimize_batch(constraint_sets, catalog, max_workers=self.max_workers, backend=self.backend):
+            index = item.pop("index")
+            if item["status"] != "Error":
+                solutions[canonical_constraints(constraint_sets[index])] = item
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._version = catalog.version
+            self._solutions = solutions
+            self.builds += 1
+            self.build_time = elapsed
+        logger.info("Preset table: %d solutions for catalog %s in %.2fs", len(solutions), catalog.version, elapsed)
+
+    def rebuild_async(self, catalog):
+        """
+        Build the table for `catalog` in a background thread.
+        """
+        with self._lock:
+            self._pending = catalog
+            if self._building:
+                return
+            self._building = True
+            self._idle.clear()
+        threading.Thread(target=self._build_pending, name='preset-table', daemon=True).start()
+
+    def _build_pending(self):
+        while True:
+            with self._lock:
+                catalog, self._pending = self._pending, None
+                if catalog is None:
+                    self._building = False
+                    self._idle.set()
+                    return
+            try:
+                self.build(catalog)
+            except Exception:
+                logger.exception("Could not build the preset table")
+
+    def wait(self, timeout=None):
+        """
+        Wait for background builds to finish; True if none is running.
+        """
+        return self._idle.wait(timeout)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._solutions),
+                "version": self._version,
+                "building": self._building,
+                "builds": self.builds,
+                "build_time": self.build_time,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
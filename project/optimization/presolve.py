@@ -0,0 +1,172 @@
+import threading
+import time
+import weakref
+
+import numpy as np
+
+from optimization.model import CONSTRAINT_FIELDS, build_model, parse_constraints
+
+# Foods compared per block in the dominance pass
+DOMINANCE_BLOCK = 512
+# Candidate dominators kept (the cheapest survivors). Bounds the pass at
+# O(foods x DOMINANCE_FRONT) when few foods are dominated, e.g. with both
+# min_ and max_calories set; a smaller front only removes fewer foods.
+DOMINANCE_FRONT = 2048
+
+
+def dominated_foods(cost, G):
+    """
+    Boolean mask of foods that can be dropped without changing the optimum.
+
+    `G` is (foods x rows) oriented so that larger is better on every row
+    (+coefficient on '>=' rows, -coefficient on '<=' rows). Food j is
+    dominated if some other food i has cost_i <= cost_j and G_i >= G_j on
+    every row: replacing each unit of j by a unit of i keeps every
+    constraint satisfied, keeps quantities integer and costs no more. An
+    all-zero food at cost 0 (i.e. "buy nothing") dominates foods that only
+    hurt or don't help.
+
+    Foods are visited cheapest first (ties: better total G first), so a
+    dominator always precedes what it dominates and each food only has to be
+    compared with the survivors before it (the first DOMINANCE_FRONT of
+    them).
+    """
+    n, k = G.shape
+    order = np.lexsort((np.arange(n), -G.sum(axis=1), cost))
+    G = G[order]
+    dominated = np.zeros(n, dtype=bool)
+    dominated[(cost[order] >= 0) & np.all(G <= 0, axis=1)] = True
+
+    front = np.empty((0, k))
+    for start in range(0, n, DOMINANCE_BLOCK):
+        block = G[start:start + DOMINANCE_BLOCK]
+        hit = dominated[start:start + DOMINANCE_BLOCK]
+
+        # By earlier survivors
+        if len(front):
+            cover = np.ones((len(front), len(block)), dtype=bool)
+            for r in range(k):
+                cover &= front[:, r, None] >= block[None, :, r]
+            hit |= cover.any(axis=0)
+
+        # By earlier foods of the same block (transitivity makes any earlier one enough)
+        cover = np.ones((len(block), len(block)), dtype=bool)
+        for r in range(k):
+            cover &= block[:, r, None] >= block[None, :, r]
+        hit |= np.triu(cover, 1).any(axis=0)
+
+        if len(front) < DOMINANCE_FRONT:
+            front = np.concatenate((front, block[~hit]))[:DOMINANCE_FRONT]
+
+    mask = np.empty(n, dtype=bool)
+    mask[order] = dominated
+    return mask
+
+
+def column_upper_bounds(model, integer=True):
+    """
+    Per-food upper bounds implied by the '<=' rows: if every coefficient of
+    a row is non-negative, x_j <= upper / a_j (floored for integer models).
+    Foods unbounded by every row get inf.
+    """
+    col_upper = np.full(model.num_vars, np.inf)
+    for k in np.flatnonzero(np.isfinite(model.row_upper)):
+        a = model.A[k]
+        if np.any(a < 0):
+            continue
+        positive = a > 0
+        bound = np.full(model.num_vars, np.inf)
+        bound[positive] = max(model.row_upper[k], 0.0) / a[positive]
+        if integer:
+            # Tolerance so 2000 / 200.0000001 (9.999999995) still allows 10;
+            # a looser bound never changes the optimum
+            bound[positive] = np.floor(bound[positive] + 1e-6)
+        np.minimum(col_upper, bound, out=col_upper)
+    return col_upper
+
+
+class PresolveCache:
+    """
+    Reduced catalogs keyed on (catalog, constraint signature). The signature
+    is the set of active constraint fields: dominance depends only on which
+    rows exist and their sense, not on their right-hand sides, so at most
+    2**len(CONSTRAINT_FIELDS) reductions exist per catalog. Entries live as
+    long as their catalog (weak keys), so a reload never serves a stale one.
+    """
+
+    def __init__(self):
+        self._reductions = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def reduce(self, catalog, fields):
+        """
+        (reduced catalog, kept row indices) with dominated foods removed.
+        Returns (entry, cached).
+        """
+        signature = frozenset(fields)
+        with self._lock:
+            entry = self._reductions.setdefault(catalog, {}).get(signature)
+            if entry is not None:
+                self.hits += 1
+                return entry, True
+            self.misses += 1
+
+        G = np.empty((len(catalog), len(fields)))
+        for r, field in enumerate(fields):
+            nutrient, sense, _ = CONSTRAINT_FIELDS[field]
+            column = catalog.column(nutrient)
+            G[:, r] = column if sense == '>=' else -column
+
+        keep = np.flatnonzero(~dominated_foods(np.asarray(catalog.cost), G))
+        if len(keep) == 0:
+            # Keep one column so every backend gets a non-empty model
+            keep = np.array([int(np.argmin(catalog.cost))])
+        entry = (catalog.subset(keep), keep)
+
+        with self._lock:
+            self._reductions.setdefault(catalog, {})[signature] = entry
+        return entry, False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "catalogs": len(self._reductions),
+                "reductions": sum(len(r) for r in self._reductions.values()),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+presolve_cache = PresolveCache()
+
+
+def presolved_model(constraints, catalog, integer=True, cache=None):
+    """
+    build_model on the presolved catalog: dominated foods removed (cached
+    per constraint signature), and per-food upper bounds from the '<='
+    rows. The model's catalog is the reduced one, so solutions are
+    extracted against model.catalog.
+
+    Returns (model, info) with info:
+      {"foods", "removed", "bounded", "fixed", "cached", "time"}
+    where "fixed" counts foods whose bound is 0 (the solver drops them).
+    """
+    cache = cache or presolve_cache
+    start = time.perf_counter()
+
+    fields = list(parse_constraints(constraints))
+    (reduced, _), cached = cache.reduce(catalog, fields)
+
+    model = build_model(constraints, reduced, integer=integer)
+    model.col_upper = column_upper_bounds(model, integer=integer)
+
+    return model, {
+        "foods": len(catalog),
+        "removed": len(catalog) - len(reduced),
+        "bounded": int(np.isfinite(model.col_upper).sum()),
+        "fixed": int((model.col_upper == 0).sum()),
+        "cached": cached,
+        "time": time.perf_counter() - start,
+    }
@@ -0,0 +1,202 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import numpy as np
+
+from optimization.backends import HighsBackend, SolveResult, get_backend, highspy
+from optimization.metrics import observe_solve
+from optimization.model import build_model, parse_constraints, row_bounds
+
+# Below this catalog size a MIP start costs HiGHS more than it saves
+# (see benchmarks/bench_resolve.py), so small models re-solve without one.
+WARM_START_MIN_FOODS = 100
+
+
+class ModelSession:
+    """
+    A built model kept in memory between solves of one interactive user.
+
+    The model has a row for every constraint field (unset ones are free), so
+    a new constraint set only changes row bounds: edits are applied in place
+    with changeRowBounds and, on catalogs of WARM_START_MIN_FOODS or more,
+    the previous plan is passed back to HiGHS as a starting solution.
+    Without highspy every solve is a cold backend solve.
+
+    If an edit only tightens bounds and the last proven-optimal plan still
+    satisfies them, that plan is returned without solving: the new feasible
+    set is a subset of the old one and still contains its optimum.
+    """
+
+    def __init__(self, catalog, backend=None):
+        self.id = uuid.uuid4().hex
+        self.catalog = catalog
+        self.backend = get_backend(backend)
+        self.created_at = time.time()
+        self.last_used = time.monotonic()
+        self.solves = 0
+        self.lock = threading.Lock()
+
+        self._highs = None
+        self._model = None
+        self._values = None
+        # (row_lower, row_upper, SolveResult) of the last proven optimum
+        self._optimum = None
+
+    @property
+    def incremental(self):
+        return isinstance(self.backend, HighsBackend)
+
+    def solve(self, constraints, time_limit=None, gap=None, catalog=None):
+        """
+        Solve `constraints`, reusing the in-memory model when possible.
+        Passing a different `catalog` (e.g. after a reload) rebuilds the model.
+        Returns (SolveResult, info) where info describes what was reused.
+        """
+        with self.lock:
+            self.last_used = time.monotonic()
+            self.solves += 1
+            if catalog is not None and catalog is not self.catalog:
+                self.catalog = catalog
+                self._highs = self._model = self._values = self._optimum = None
+
+            if not self.incremental:
+                model = build_model(constraints, self.catalog)
+                result = self.backend.solve(model, time_limit=time_limit, gap=gap)
+                observe_solve(model, result, self.backend, result.solve_time)
+                return result, {"rebuilt": True, "changed_rows": None, "warm_start": False, "reused": False}
+
+            start = time.perf_counter()
+            rebuilt = self._highs is None
+            if rebuilt:
+                self._model = build_model(constraints, self.catalog, all_fields=True)
+                self._highs = highspy.Highs()
+                self._highs.setOptionValue('output_flag', False)
+                self._highs.passModel(HighsBackend.to_highs_lp(self._model))
+                changed = list(range(self._model.num_rows))
+            else:
+                changed = self._update_bounds(constraints)
+                reused = self._reuse_optimum(start)
+                if reused is not None:
+                    return reused, {"rebuilt": False, "changed_rows": len(changed), "warm_start": False,
+                                    "reused": True}
+
+            h = self._highs
+            # Keep the model, drop stale search state from the previous run
+            h.clearSolver()
+            HighsBackend.configure(h, time_limit, gap)
+
+            warm_start = self._values is not None and len(self.catalog) >= WARM_START_MIN_FOODS
+            if warm_start:
+                solution = highspy.HighsSolution()
+                solution.col_value = self._values
+                solution.value_valid = True
+                h.setSolution(solution)
+
+            HighsBackend.run(h)
+            result = HighsBackend.result(h, self._model, start)
+            observe_solve(self._model, result, self.backend, result.solve_time)
+            if result.values is not None:
+                self._values = result.values
+            if result.status == 'Optimal' and not gap:
+                self._optimum = (self._model.row_lower.copy(), self._model.row_upper.copy(), result)
+
+            return result, {"rebuilt": rebuilt, "changed_rows": len(changed), "warm_start": warm_start,
+                            "reused": False}
+
+    def _reuse_optimum(self, start):
+        """
+        The last optimum as a SolveResult if it is provably still optimal
+        under the current (tightened) bounds, else None.
+        """
+        if self._optimum is None:
+            return None
+        old_lower, old_upper, result = self._optimum
+        model = self._model
+        tightened = np.all(model.row_lower >= old_lower) and np.all(model.row_upper <= old_upper)
+        if not tightened:
+            return None
+
+        activity = model.A @ np.rint(result.values)
+        tol = 1e-6
+        if np.any(activity < model.row_lower - tol) or np.any(activity > model.row_upper + tol):
+            return None
+
+        return SolveResult(
+            'Optimal',
+            objective_value=result.objective_value,
+            values=result.values,
+            solve_time=time.perf_counter() - start,
+            mip_gap=result.mip_gap,
+        )
+
+    def _update_bounds(self, constraints):
+        """
+        Apply the new constraint set as row bound changes; returns changed rows.
+        """
+        model = self._model
+        lower, upper = row_bounds(parse_constraints(constraints), model.fields)
+        changed = np.flatnonzero((lower != model.row_lower) | (upper != model.row_upper))
+        highs_lower, highs_upper = HighsBackend.row_bounds(lower, upper)
+        for k in changed:
+            self._highs.changeRowBounds(int(k), float(highs_lower[k]), float(highs_upper[k]))
+        model.row_lower, model.row_upper = lower, upper
+        return changed.tolist()
+
+
+class SessionManager:
+    """
+    Live ModelSessions with bounded memory: sessions idle for longer than
+    `idle_timeout` seconds are dropped, and beyond `max_sessions` the least
+    recently used one goes first.
+    """
+
+    def __init__(self, backend=None, max_sessions=64, idle_timeout=900):
+        self.backend = backend
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+        self.evictions = 0
+
+    def create(self, catalog):
+        session = ModelSession(catalog, backend=self.backend)
+        with self._lock:
+            self._evict_idle()
+            self._sessions[session.id] = session
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self.evictions += 1
+        return session
+
+    def get(self, session_id):
+        with self._lock:
+            self._evict_idle()
+            session = self._sessions.get(session_id)
+            if session is not None:
+                # Requests answered from the result cache or the preset
+                # table never reach session.solve, but still count as use
+                session.last_used = time.monotonic()
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def close(self, session_id):
+        with self._lock:
+            return self._sessions.pop(session_id, None) is not None
+
+    def stats(self):
+        with self._lock:
+            self._evict_idle()
+            return {
+                "sessions": len(self._sessions),
+                "max_sessions": self.max_sessions,
+                "idle_timeout": self.idle_timeout,
+                "evictions": self.evictions,
+            }
+
+    def _evict_idle(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        for session_id in [s.id for s in self._sessions.values() if s.last_used < cutoff]:
+            del self._sessions[session_id]
+            self.evictions += 1
@@ -0,0 +1,356 @@
+import bisect
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+import threading
+
+import numpy as np
+
+from optimization.catalog import FoodCatalog
+
+logger = logging.getLogger(__name__)
+
+# Bump when the on-disk layout changes; old compiled directories are ignored
+STORE_FORMAT = 1
+
+# CatalogStore._failed_stamp when the current source version loaded fine
+_NO_FAILURE = object()
+
+# Files of one compiled catalog directory (all .npy, memory-mapped on open)
+#   matrix.npy          float64 (foods x nutrients)
+#   cost.npy            float64 (foods,)
+#   names.npy           uint8, every name UTF-8 encoded and concatenated
+#   name_offsets.npy    int64 (foods + 1,), name i = names[offsets[i]:offsets[i+1]]
+#   name_order.npy      int64, food indices sorted by name (name index)
+#   category_codes.npy  int32 (foods,), -1 = no category
+#   category_order.npy  int64, food indices grouped by category code
+#   category_start.npy  int64 (categories + 1,), group k = order[start[k]:start[k+1]]
+#   meta.json           nutrients, category names, food count, source digest
+
+
+def read_source(path):
+    """
+    Foods from a JSON file shaped like data/foods.json, or from a CSV with a
+    'name' column, a 'cost' column, an optional 'category' column and one
+    column per nutrient (empty cells are 0).
+    """
+    if path.lower().endswith('.csv'):
+        foods = {}
+        with open(path, newline='') as f:
+            for row in csv.DictReader(f):
+                name = row.pop('name')
+                if name in foods:
+                    raise ValueError(f"Duplicate food {name!r} in {path}")
+                category = row.pop('category', None) or None
+                food = {key: float(value) if value else 0.0 for key, value in row.items()}
+                if category is not None:
+                    food['category'] = category
+                foods[name] = food
+        return foods
+
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+    return h.hexdigest()[:20]
+
+
+def compile_catalog(source_path, out_dir, digest=None):
+    """
+    Compile `source_path` into `out_dir`/<digest>/ and return that directory.
+    Written to a temporary directory first and renamed into place, so readers
+    never see a partial catalog; an existing compiled copy is reused.
+    """
+    digest = digest or file_digest(source_path)
+    target = os.path.join(out_dir, f"v{STORE_FORMAT}-{digest}")
+    if os.path.exists(os.path.join(target, 'meta.json')):
+        return target
+
+    os.makedirs(out_dir, exist_ok=True)
+    catalog = FoodCatalog.from_foods_data(read_source(source_path))
+
+    tmp = tempfile.mkdtemp(prefix='.compiling-', dir=out_dir)
+    try:
+        encoded = [name.encode('utf-8') for name in catalog.names]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(b) for b in encoded], out=offsets[1:])
+        # UTF-8 byte order is code point order, so this matches str sorting
+        name_order = np.array(sorted(range(len(encoded)), key=encoded.__getitem__), dtype=np.int64)
+
+        categories = sorted({c for c in catalog.categories or () if c is not None})
+        code_of = {c: k for k, c in enumerate(categories)}
+        codes = np.array([code_of.get(c, -1) for c in catalog.categories or [None] * len(catalog)], dtype=np.int32)
+        grouped = np.flatnonzero(codes >= 0)
+        category_order = grouped[np.argsort(codes[grouped], kind='stable')].astype(np.int64)
+        category_start = np.searchsorted(codes[category_order], np.arange(len(categories) + 1)).astype(np.int64)
+
+        arrays = {
+            'matrix': catalog.matrix,
+            'cost': catalog.cost,
+            'names': np.frombuffer(b''.join(encoded), dtype=np.uint8),
+            'name_offsets': offsets,
+            'name_order': name_order,
+            'category_codes': codes,
+            'category_order': category_order,
+            'category_start': category_start,
+        }
+        for name, array in arrays.items():
+            np.save(os.path.join(tmp, f"{name}.npy"), array)
+
+        meta = {
+            'format': STORE_FORMAT,
+            'digest': digest,
+            'source': os.path.abspath(source_path),
+            'num_foods': len(catalog),
+            'nutrients': catalog.nutrients,
+            'categories': categories,
+        }
+        with open(os.path.join(tmp, 'meta.json'), 'w') as f:
+            json.dump(meta, f)
+
+        try:
+            os.rename(tmp, target)
+        except OSError:
+            # Another process compiled the same digest first
+            if not os.path.exists(os.path.join(target, 'meta.json')):
+                raise
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+    return target
+
+
+class NameTable:
+    """
+    Read-only sequence of food names decoded on access from the mapped
+    UTF-8 blob, so no per-worker list of Python strings is built.
+    """
+
+    def __init__(self, blob, offsets):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def encoded(self, i):
+        return self._blob[self._offsets[i]:self._offsets[i + 1]].tobytes()
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(len(self)))]
+        if i < 0:
+            i += len(self)
+        if not 0 <= i < len(self):
+            raise IndexError(i)
+        return self.encoded(i).decode('utf-8')
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.encoded(i).decode('utf-8')
+
+
+class NameIndex:
+    """
+    name -> row lookup by binary search over the stored sorted order
+    (dict-like: [], get, in).
+    """
+
+    def __init__(self, names, order):
+        self._names = names
+        self._order = order
+
+    def get(self, name, default=None):
+        key = name.encode('utf-8')
+        order = self._order
+        pos = bisect.bisect_left(range(len(order)), key, key=lambda k: self._names.encoded(order[k]))
+        if pos < len(order) and self._names.encoded(order[pos]) == key:
+            return int(order[pos])
+        return default
+
+    def __getitem__(self, name):
+        i = self.get(name)
+        if i is None:
+            raise KeyError(name)
+        return i
+
+    def __contains__(self, name):
+        return self.get(name) is not None
+
+    def __len__(self):
+        return len(self._order)
+
+
+class MappedCatalog(FoodCatalog):
+    """
+    FoodCatalog backed by a compiled directory. Every array is opened with
+    mmap_mode='r', so processes mapping the same directory share its pages
+    and opening costs almost nothing regardless of catalog size.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, 'meta.json'), 'r') as f:
+            meta = json.load(f)
+        if meta.get('format') != STORE_FORMAT:
+            raise ValueError(f"{path} has store format {meta.get('format')}, expected {STORE_FORMAT}")
+
+        def load(name):
+            return np.load(os.path.join(path, f"{name}.npy"), mmap_mode='r')
+
+        self.nutrients = meta['nutrients']
+        self.matrix = load('matrix')
+        self.cost = load('cost')
+        self.version = meta['digest']
+        self.names = NameTable(load('names'), load('name_offsets'))
+        self.index = NameIndex(self.names, load('name_order'))
+        self.nutrient_index = {nutrient: j for j, nutrient in enumerate(self.nutrients)}
+
+        self.category_names = meta['categories']
+        self._category_codes = load('category_codes')
+        self._category_order = load('category_order')
+        self._category_start = load('category_start')
+
+        self._check_shapes()
+
+    @property
+    def categories(self):
+        codes = self._category_codes
+        return [self.category_names[c] if c >= 0 else None for c in codes] if self.category_names else None
+
+    def category_indices(self, category):
+        try:
+            k = self.category_names.index(category)
+        except ValueError:
+            return np.zeros(0, dtype=np.int64)
+        return np.asarray(self._category_order[self._category_start[k]:self._category_start[k + 1]])
+
+    def __reduce__(self):
+        # Pickle as a path: worker processes re-map the files instead of copying arrays
+        return (MappedCatalog, (self.path,))
+
+
+class CatalogStore:
+    """
+    Serves the current MappedCatalog for a source file (JSON or CSV) and
+    hot-swaps it when the file changes:
+
+      - current() stats the source (cheap) on every call
+      - on change one caller compiles the new version while everyone else
+        keeps getting the previous catalog, then the reference is swapped;
+        requests already holding the old catalog finish on it undisturbed
+      - compiled directories are keyed by content digest, so every worker
+        process maps the same files and a touched-but-unchanged source is
+        not recompiled
+      - if the source is missing or doesn't compile (e.g. half-written by an
+        editor), the error is logged once and the previous catalog stays in
+        service until the file changes again; only the first load raises
+    Callbacks registered with subscribe() run after each swap.
+    """
+
+    def __init__(self, source_path, cache_dir=None, keep=2):
+        self.source_path = source_path
+        self.cache_dir = cache_dir or os.path.join(os.path.dirname(os.path.abspath(source_path)), '.catalog_cache')
+        self.keep = keep
+        self._catalog = None
+        self._stamp = None
+        # Stamp of the source version that last failed to load (None: missing)
+        self._failed_stamp = _NO_FAILURE
+        self._lock = threading.Lock()
+        self._listeners = []
+        self.reloads = 0
+        self.failures = 0
+
+    def subscribe(self, callback):
+        """
+        Call `callback(catalog)` after every catalog swap.
+        """
+        self._listeners.append(callback)
+
+    def current(self):
+        try:
+            stamp = self._source_stamp()
+        except OSError as exc:
+            if self._catalog is None:
+                raise
+            self._failed(None, exc)
+            return self._catalog
+        if stamp == self._stamp or stamp == self._failed_stamp:
+            return self._catalog
+
+        # Only the first caller reloads; the rest keep serving the old catalog
+        # (they block only if there is no catalog yet)
+        if not self._lock.acquire(blocking=self._catalog is None):
+            return self._catalog
+        try:
+            if stamp != self._stamp:
+                self._load(stamp)
+        finally:
+            self._lock.release()
+        return self._catalog
+
+    def _source_stamp(self):
+        st = os.stat(self.source_path)
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load(self, stamp):
+        try:
+            digest = file_digest(self.source_path)
+            if self._catalog is not None and self._catalog.version == digest:
+                # Touched but unchanged
+                self._stamp = stamp
+                self._failed_stamp = _NO_FAILURE
+                return
+
+            path = compile_catalog(self.source_path, self.cache_dir, digest=digest)
+            catalog = MappedCatalog(path)
+        except Exception as exc:
+            if self._catalog is None:
+                raise
+            self._failed(stamp, exc)
+            return
+
+        self._catalog = catalog
+        self._stamp = stamp
+        self._failed_stamp = _NO_FAILURE
+        self.reloads += 1
+        logger.info("Loaded catalog %s (%d foods)", path, len(catalog))
+
+        for callback in self._listeners:
+            callback(catalog)
+        self._prune(keep_path=path)
+
+    def _failed(self, stamp, exc):
+        """
+        Remember that source version `stamp` can't be loaded, so it isn't
+        retried (or logged) again until the file changes.
+        """
+        if stamp == self._failed_stamp:
+            return
+        self._failed_stamp = stamp
+        self.failures += 1
+        logger.error("Could not load catalog %s (%s: %s); still serving %s",
+                     self.source_path, type(exc).__name__, exc, self._catalog.version)
+
+    def _prune(self, keep_path):
+        """
+        Delete all but the newest `keep` compiled versions. Open mappings of
+        deleted files stay valid until released.
+        """
+        entries = [
+            os.path.join(self.cache_dir, d) for d in os.listdir(self.cache_dir)
+            if d.startswith(f"v{STORE_FORMAT}-")
+        ]
+        entries.sort(key=os.path.getmtime, reverse=True)
+        for path in entries[self.keep:]:
+            if path != keep_path:
+                shutil.rmtree(path, ignore_errors=True)
@@ -0,0 +1,100 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from optimization.backends import get_backend
+from optimization.ilp_solver import as_catalog, extract_solution
+from optimization.model import CONSTRAINT_FIELDS
+from optimization.sessions import ModelSession
+
+# Upper bound on points per sweep request
+MAX_SWEEP_POINTS = 1000
+
+
+def sweep_values(start, stop, step):
+    """
+    start, start + step, ... up to and including stop (within rounding).
+    """
+    if not all(math.isfinite(v) for v in (start, stop, step)):
+        raise ValueError("start, stop and step must be finite")
+    if step <= 0:
+        raise ValueError("step must be positive")
+    if stop < start:
+        raise ValueError("stop must be >= start")
+    # Compared as a float first: a huge range would overflow int()
+    count = np.floor((stop - start) / step + 1e-9) + 1
+    if count > MAX_SWEEP_POINTS:
+        raise ValueError(f"Sweep has {count:.0f} points; the limit is {MAX_SWEEP_POINTS}")
+    return [round(start + k * step, 10) for k in range(int(count))]
+
+
+def sweep_nutrition(constraints, foods_data, parameter, start, stop, step, workers=None, backend=None,
+                    time_limit=None):
+    """
+    Minimum cost as `parameter` (a constraint field such as 'min_protein')
+    sweeps from `start` to `stop` in `step`s, all other constraints fixed.
+
+    The range is cut into one contiguous segment per worker. Each segment
+    walks its points in the direction that tightens the bound (ascending for
+    min_*, descending for max_*) on one ModelSession, so the model is built
+    once, only that row's bound changes, and the previous plan is reused
+    or used as a warm start. Once a point is infeasible, every tighter point
+    in the segment is too and is not solved.
+
+    `time_limit` (seconds) bounds the whole sweep: each solve gets the
+    time left, a point stopped by it is 'Feasible' with its gap (or 'Not
+    Solved'), and points not reached in time are 'Not Solved' with
+    "skipped": true and the sweep "timed_out".
+
+    Returns {"parameter", "points": [...], "frontier": [[value, cost], ...],
+    "timed_out"} with points in ascending order of value.
+    """
+    deadline = time.perf_counter() + time_limit if time_limit else None
+    if parameter not in CONSTRAINT_FIELDS:
+        raise ValueError(f"Unknown parameter {parameter!r}; choose from {sorted(CONSTRAINT_FIELDS)}")
+
+    catalog = as_catalog(foods_data)
+    backend = get_backend(backend)
+    values = sweep_values(float(start), float(stop), float(step))
+
+    # Tightening direction
+    ascending = CONSTRAINT_FIELDS[parameter][1] == '>='
+    ordered = values if ascending else values[::-1]
+
+    workers = max(1, min(workers or 1, len(ordered)))
+    segments = [[float(v) for v in seg] for seg in np.array_split(ordered, workers) if len(seg)]
+
+    def solve_segment(segment):
+        session = ModelSession(catalog, backend)
+        points = []
+        infeasible = False
+        for value in segment:
+            remaining = None if deadline is None else deadline - time.perf_counter()
+            if infeasible or (remaining is not None and remaining <= 0):
+                points.append({"value": value, "status": "Infeasible" if infeasible else "Not Solved",
+                               "objective_value": None, "quantities": {}, "skipped": True})
+                continue
+            # As a string, like form input: a numeric 0 would read as "unset"
+            result, _ = session.solve(dict(constraints, **{parameter: str(value)}), time_limit=remaining)
+            solution = extract_solution(result, catalog)
+            infeasible = solution["status"] == 'Infeasible'
+            if solution["quantities"]:
+                solution["totals"] = catalog.totals(solution["quantities"])
+            points.append({"value": value, **solution})
+        return points
+
+    if len(segments) == 1:
+        results = [solve_segment(segments[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=len(segments)) as pool:
+            results = list(pool.map(solve_segment, segments))
+
+    points = sorted((p for segment in results for p in segment), key=lambda p: p["value"])
+    return {
+        "parameter": parameter,
+        "points": points,
+        "frontier": [[p["value"], p["objective_value"]] for p in points if p["objective_value"] is not None],
+        "timed_out": deadline is not None and any(p["status"] == "Not Solved" for p in points),
+    }
@@ -0,0 +1,590 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pulp
+
+from optimization.backends import HighsBackend, SolveResult, get_backend, highspy, pulp_result
+from optimization.ilp_solver import as_catalog, plan_cost, quantities_from_values
+from optimization.metrics import PHASE_SECONDS, observe_solve
+from optimization.model import build_model
+from optimization.presolve import column_upper_bounds
+
+METHODS = ('decomposed', 'monolithic')
+# Upper bound on days per plan
+MAX_DAYS = 14
+# Days per window re-optimized by the decomposition. Exact MIPs grow
+# fast with days: about 0.2 s for 2 days, 0.7 s for 3 and 10-30 s for 4
+# on the real catalog with variety rows.
+DEFAULT_WINDOW = 2
+# Share of the time limit left that the look-ahead rolling horizon may
+# use; the rest is kept for the monolithic fallback
+LOOKAHEAD_SHARE = 0.5
+# Relative cost differences below this count as none (window improvements,
+# gap to the lower bound)
+IMPROVEMENT_TOLERANCE = 1e-9
+
+
+class SparseMIP:
+    """
+    minimize cost @ x  s.t.  row_lower <= M @ x <= row_upper,
+                             0 <= x <= col_upper, x_j integer unless continuous_j
+
+    M is kept as COO triplets. Variables are integer unless added with
+    integer=False; 0/1 variables are integers with upper bound 1. Built
+    block by block with add_columns / add_rows, then solved by HiGHS
+    in-process or PuLP + CBC.
+    """
+
+    integer = True
+
+    def __init__(self):
+        self.cost = np.empty(0)
+        self.col_upper = np.empty(0)
+        self.continuous = np.empty(0, dtype=bool)
+        self.row_lower = np.empty(0)
+        self.row_upper = np.empty(0)
+        self._rows, self._cols, self._vals = [], [], []
+
+    @property
+    def num_vars(self):
+        return len(self.cost)
+
+    @property
+    def num_rows(self):
+        return len(self.row_lower)
+
+    def add_columns(self, cost, upper, integer=True):
+        """
+        Append columns; returns their indices.
+        """
+        start = self.num_vars
+        self.cost = np.concatenate((self.cost, cost))
+        self.col_upper = np.concatenate((self.col_upper, upper))
+        self.continuous = np.concatenate((self.continuous, np.full(len(cost), not integer)))
+        return np.arange(start, self.num_vars)
+
+    def add_rows(self, lower, upper, rows, cols, vals):
+        """
+        Append len(lower) rows; `rows` index the new rows from 0.
+        """
+        start = self.num_rows
+        self.row_lower = np.concatenate((self.row_lower, lower))
+        self.row_upper = np.concatenate((self.row_upper, upper))
+        self._rows.append(np.asarray(rows) + start)
+        self._cols.append(np.asarray(cols))
+        self._vals.append(np.asarray(vals, dtype=np.float64))
+
+    def triplets(self):
+        if not self._rows:
+            return np.empty(0, dtype=int), np.empty(0, dtype=int), np.empty(0)
+        return np.concatenate(self._rows), np.concatenate(self._cols), np.concatenate(self._vals)
+
+    def solve(self, backend, time_limit=None):
+        if isinstance(backend, HighsBackend):
+            return self._solve_highs(time_limit)
+        return self._solve_pulp(time_limit)
+
+    def relaxation(self, backend, time_limit=None):
+        """
+        (status, objective, row duals) of the LP relaxation; objective and
+        duals are None unless status is 'Optimal' (e.g. 'Infeasible', or
+        'Not Solved' when stopped by `time_limit`). Duals are
+        d(objective)/d(rhs): <= 0 on binding '<=' rows.
+        """
+        start = time.perf_counter()
+        if isinstance(backend, HighsBackend):
+            h = highspy.Highs()
+            HighsBackend.configure(h, time_limit, integer=False)
+            h.passModel(self._highs_lp(integer=False))
+            h.run()
+            result = HighsBackend.result(h, self, start)
+            if result.status != 'Optimal':
+                return result.status, None, None
+            return 'Optimal', result.objective_value, np.asarray(h.getSolution().row_dual)
+
+        problem, x, constraints = self._pulp_problem(integer=False)
+        time_limit = self._pulp_time_left(time_limit, start)
+        if time_limit is not None and time_limit <= 0:
+            return 'Not Solved', None, None
+        problem.solve(pulp.PULP_CBC_CMD(msg=0, timeLimit=time_limit))
+        result = pulp_result(problem, x, start)
+        if result.status != 'Optimal':
+            return result.status, None, None
+        duals = np.zeros(self.num_rows)
+        for k, (lower, upper) in constraints.items():
+            duals[k] = sum(c.pi or 0.0 for c in (lower, upper) if c is not None)
+        return 'Optimal', result.objective_value, duals
+
+    def _highs_lp(self, integer=True):
+        rows, cols, vals = self.triplets()
+        order = np.lexsort((cols, rows))
+        inf = highspy.kHighsInf
+
+        lp = highspy.HighsLp()
+        lp.num_col_ = self.num_vars
+        lp.num_row_ = self.num_rows
+        lp.col_cost_ = self.cost
+        lp.col_lower_ = np.zeros(self.num_vars)
+        lp.col_upper_ = np.where(np.isinf(self.col_upper), inf, self.col_upper)
+        lp.row_lower_, lp.row_upper_ = HighsBackend.row_bounds(self.row_lower, self.row_upper)
+        lp.a_matrix_.format_ = highspy.MatrixFormat.kRowwise
+        lp.a_matrix_.num_col_ = self.num_vars
+        lp.a_matrix_.num_row_ = self.num_rows
+        lp.a_matrix_.start_ = np.searchsorted(rows[order], np.arange(self.num_rows + 1)).astype(np.int32)
+        lp.a_matrix_.index_ = cols[order].astype(np.int32)
+        lp.a_matrix_.value_ = vals[order]
+        if integer:
+            kinds = (highspy.HighsVarType.kInteger, highspy.HighsVarType.kContinuous)
+            lp.integrality_ = [kinds[c] for c in self.continuous.tolist()]
+        return lp
+
+    def _solve_highs(self, time_limit):
+        start = time.perf_counter()
+        h = highspy.Highs()
+        HighsBackend.configure(h, time_limit)
+        h.passModel(self._highs_lp())
+        HighsBackend.run(h)
+        return HighsBackend.result(h, self, start)
+
+    def _pulp_problem(self, integer=True):
+        """
+        (problem, variables, {row: (>= constraint, <= constraint)}).
+        """
+        problem = pulp.LpProblem("Weekly_Plan", pulp.LpMinimize)
+        x = [
+            pulp.LpVariable(f"x{j}", lowBound=0, upBound=None if np.isinf(ub) else float(ub),
+                            cat=pulp.LpInteger if integer and not continuous else pulp.LpContinuous)
+            for j, (ub, continuous) in enumerate(zip(self.col_upper, self.continuous))
+        ]
+        nz = np.flatnonzero(self.cost)
+        problem += pulp.LpAffineExpression(zip([x[j] for j in nz], self.cost[nz].tolist())), "Total_Cost"
+
+        rows, cols, vals = self.triplets()
+        order = np.argsort(rows, kind='stable')
+        bounds = np.searchsorted(rows[order], np.arange(self.num_rows + 1))
+        constraints = {}
+        for k in range(self.num_rows):
+            terms = order[bounds[k]:bounds[k + 1]]
+            expression = pulp.LpAffineExpression(zip([x[j] for j in cols[terms]], vals[terms].tolist()))
+            lower = upper = None
+            if np.isfinite(self.row_lower[k]):
+                lower = expression >= float(self.row_lower[k])
+                problem += lower, f"R{k}_lo"
+            if np.isfinite(self.row_upper[k]):
+                upper = expression <= float(self.row_upper[k])
+                problem += upper, f"R{k}_up"
+            constraints[k] = (lower, upper)
+        return problem, x, constraints
+
+    def _solve_pulp(self, time_limit):
+        start = time.perf_counter()
+        problem, x, _ = self._pulp_problem()
+        time_limit = self._pulp_time_left(time_limit, start)
+        if time_limit is not None and time_limit <= 0:
+            return SolveResult('Not Solved', solve_time=time.perf_counter() - start)
+        problem.solve(pulp.PULP_CBC_CMD(msg=0, timeLimit=time_limit))
+        return pulp_result(problem, x, start)
+
+    @staticmethod
+    def _pulp_time_left(time_limit, start):
+        # Building a large PuLP problem takes seconds, outside CBC's own limit
+        return None if time_limit is None else time_limit - (time.perf_counter() - start)
+
+
+def serving_bounds(model, max_servings=None):
+    """
+    Most units of each food an optimal day plan needs: its column bound,
+    the weekly cap, and enough units to meet every '>=' row it helps
+    (more of it only costs money). Finite, so usable as the big-M of
+    "food j is used" indicators.
+    """
+    need = np.zeros(model.num_vars)
+    for k in np.flatnonzero(np.isfinite(model.row_lower)):
+        a = model.A[k]
+        positive = a > 0
+        need[positive] = np.maximum(need[positive], np.ceil(max(model.row_lower[k], 0.0) / a[positive] - 1e-9))
+    bounds = need if model.col_upper is None else np.minimum(need, model.col_upper)
+    if max_servings is not None:
+        bounds = np.minimum(bounds, max_servings)
+    return bounds
+
+
+def add_day(mip, model, x_cost, x_upper, big_m=None, integer=True):
+    """
+    Add one day's foods and nutrient rows to `mip`. With `big_m`, also a
+    0/1 "food is used" column per food with x_j <= big_m_j * y_j.
+    integer=False adds the day relaxed (continuous columns).
+    Returns (x columns, y columns or None).
+    """
+    n = model.num_vars
+    x = mip.add_columns(x_cost, x_upper, integer)
+    rows, foods = np.nonzero(model.A)
+    mip.add_rows(model.row_lower, model.row_upper, rows, x[foods], model.A[rows, foods])
+    if big_m is None:
+        return x, None
+
+    y = mip.add_columns(np.zeros(n), np.ones(n), integer)
+    link = np.arange(n)
+    mip.add_rows(
+        np.full(n, -np.inf), np.zeros(n),
+        np.concatenate((link, link)), np.concatenate((x, y)), np.concatenate((np.ones(n), -big_m)),
+    )
+    return x, y
+
+
+def add_week_rows(mip, x, y, servings, no_consecutive):
+    """
+    Coupling rows over per-day columns x[d], y[d]:
+      - sum over days of x_jd <= servings_j (if `servings` is given)
+      - y_jd + y_j(d+1) <= 1 (if no_consecutive)
+    Returns the servings row indices (or None).
+    """
+    days, n = len(x), len(x[0])
+    foods = np.arange(n)
+    rows = None
+    if servings is not None:
+        rows = mip.num_rows + foods
+        mip.add_rows(np.full(n, -np.inf), servings, np.tile(foods, days), np.concatenate(x), np.ones(n * days))
+    if no_consecutive:
+        for d in range(days - 1):
+            mip.add_rows(
+                np.full(n, -np.inf), np.ones(n),
+                np.concatenate((foods, foods)), np.concatenate((y[d], y[d + 1])), np.ones(2 * n),
+            )
+    return rows
+
+
+def build_week(model, big_m, upper, servings, no_consecutive):
+    """
+    MIP over consecutive days: one copy of the day model per entry of
+    `upper` (that day's quantity bounds) plus the coupling rows, with
+    `servings` the per-food cap over these days (or None).
+    Returns (mip, x, servings rows) where x[d] are day d's columns.
+    """
+    cost = np.asarray(model.cost, dtype=np.float64)
+    mip = SparseMIP()
+    columns = [add_day(mip, model, cost, u, big_m=big_m if no_consecutive else None) for u in upper]
+    x = [c[0] for c in columns]
+    rows = add_week_rows(mip, x, [c[1] for c in columns], servings, no_consecutive)
+    return mip, x, rows
+
+
+def plan_week(constraints, foods_data, days=7, max_servings=None, no_consecutive=True,
+              method='decomposed', backend=None, workers=None, window=DEFAULT_WINDOW, rounds=10,
+              time_limit=None):
+    """
+    Plan `days` days, each meeting `constraints`, at minimum total cost
+    under variety constraints across days:
+      - max_servings:   units of one food allowed over the whole plan
+      - no_consecutive: a food used one day cannot be used the next
+
+    `method` (see METHODS):
+      - 'monolithic': one MIP with every day's foods, nutrient rows and
+        coupling rows. Days are interchangeable, so its search grows
+        quickly with days (see DEFAULT_WINDOW).
+      - 'decomposed':
+          1. LP relaxation of the monolithic model: the lower bound, and
+             the duals of the servings rows as prices.
+          2. Rolling horizon: days in order, each a one-day solve within
+             the servings left and without the previous day's foods.
+             Run with plain and with dual-priced costs (in parallel);
+             the cheaper week is kept. If greedy days use up servings
+             the later days need, it is rerun with a look-ahead: each
+             day is solved together with the LP relaxation of the days
+             after it, which reserves their servings. If that finds no
+             week either (or runs out of its LOOKAHEAD_SHARE of the
+             time), the monolithic MIP is solved with the time left.
+          3. Fix-and-optimize rounds: windows of at most `window` days,
+             always separated by a fixed day, are re-solved exactly in
+             parallel (threads, like the sweep). Each window may only use
+             the foods allowed next to its fixed neighbours and its share
+             of the servings left, so the merged week stays feasible.
+             Window positions shift every pass; stops after a full cycle
+             without improvement or after `rounds` cycles.
+        Returns a feasible week within its gap to the LP bound.
+
+    `time_limit` (seconds) bounds the whole call: every solve of either
+    method gets the time left, and whatever is found by then is returned.
+
+    No dominance presolve: once the cheapest foods run out of servings,
+    the foods they dominate are exactly the ones needed.
+
+    Returns {"status", "method", "objective_value", "lower_bound", "gap",
+             "days": [{"day", "quantities", "objective_value", "totals"}],
+             "time", "solves"}
+    where "gap" = (cost - lower_bound) / cost. "status" is 'Optimal' when
+    the MIP (or a zero gap) proves optimality, 'Feasible' otherwise,
+    'Infeasible' when the constraints can't be met, and 'Not Solved'
+    when no feasible week was found within `time_limit`.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown method {method!r}; choose from {METHODS}")
+    if not 1 <= days <= MAX_DAYS:
+        raise ValueError(f"days must be between 1 and {MAX_DAYS}")
+    if max_servings is not None and max_servings < 0:
+        raise ValueError("max_servings must be >= 0")
+    if window < 1:
+        raise ValueError("window must be >= 1")
+    catalog = as_catalog(foods_data)
+    backend = get_backend(backend)
+
+    start = time.perf_counter()
+    deadline = None if time_limit is None else start + time_limit
+    with PHASE_SECONDS.time(phase='build'):
+        model = build_model(constraints, catalog)
+        model.col_upper = column_upper_bounds(model)
+        big_m = serving_bounds(model, max_servings)
+
+    if _expired(deadline):
+        week = _not_solved(0)
+    elif method == 'monolithic':
+        week = _solve_monolithic(model, big_m, days, max_servings, no_consecutive, backend, _time_left(deadline))
+    else:
+        week = _solve_decomposed(model, big_m, days, max_servings, no_consecutive, backend, workers,
+                                 window, rounds, deadline)
+
+    plans = []
+    if week["values"] is not None:
+        for d, values in enumerate(week["values"]):
+            quantities = quantities_from_values(values, catalog)
+            plans.append({
+                "day": d + 1,
+                "quantities": quantities,
+                "objective_value": plan_cost(quantities, catalog),
+                "totals": catalog.totals(quantities),
+            })
+    cost = round(sum(p["objective_value"] for p in plans), 9) if plans else None
+    lower_bound = week["lower_bound"]
+    gap = None
+    if cost is not None and lower_bound is not None:
+        gap = max(cost - lower_bound, 0.0) / cost if cost > 0 else 0.0
+
+    status = week["status"]
+    if status == 'Feasible' and gap is not None and gap <= IMPROVEMENT_TOLERANCE:
+        status = 'Optimal'
+    return {
+        "status": status,
+        "method": method,
+        "objective_value": cost,
+        "lower_bound": lower_bound,
+        "gap": gap,
+        "days": plans,
+        "time": time.perf_counter() - start,
+        "solves": week["solves"],
+    }
+
+
+def compare_week_plans(constraints, foods_data, time_limit=None, **options):
+    """
+    plan_week with both METHODS (same `options`), plus "cost_gap": the
+    decomposed week's extra cost relative to the monolithic one (None
+    unless both found a week). `time_limit` is split between the methods:
+    the first gets half of it, the second whatever is left.
+    """
+    deadline = None if time_limit is None else time.perf_counter() + time_limit
+    plans = {}
+    for k, method in enumerate(METHODS):
+        share = None if deadline is None else max(_time_left(deadline), 0.0) / (len(METHODS) - k)
+        plans[method] = plan_week(constraints, foods_data, method=method, time_limit=share, **options)
+    decomposed = plans['decomposed']["objective_value"]
+    monolithic = plans['monolithic']["objective_value"]
+    cost_gap = None
+    if decomposed is not None and monolithic is not None:
+        cost_gap = (decomposed - monolithic) / monolithic if monolithic else 0.0
+    return {**plans, "cost_gap": cost_gap}
+
+
+def _servings(max_servings, n):
+    return None if max_servings is None else np.full(n, float(max_servings))
+
+
+def _time_left(deadline):
+    return None if deadline is None else deadline - time.perf_counter()
+
+
+def _expired(deadline):
+    return deadline is not None and time.perf_counter() >= deadline
+
+
+def _not_solved(solves):
+    return {"status": 'Not Solved', "values": None, "lower_bound": None, "solves": solves}
+
+
+def _solve_monolithic(model, big_m, days, max_servings, no_consecutive, backend, time_limit):
+    with PHASE_SECONDS.time(phase='build'):
+        mip, x, _ = build_week(model, big_m, [model.col_upper] * days, _servings(max_servings, model.num_vars),
+                               no_consecutive)
+
+    result = mip.solve(backend, time_limit)
+    observe_solve(mip, result, backend, result.solve_time)
+    week = {"status": result.status, "values": None, "lower_bound": None, "solves": 1}
+    if result.status in ('Optimal', 'Feasible'):
+        week["values"] = np.array([np.rint(result.values[x[d]]) for d in range(days)])
+        # No bound when the gap is unknown (see pulp_result)
+        if result.mip_gap is not None:
+            week["lower_bound"] = result.objective_value * (1 - result.mip_gap)
+    return week
+
+
+def _solve_decomposed(model, big_m, days, max_servings, no_consecutive, backend, workers, window, rounds,
+                      deadline):
+    n = model.num_vars
+    cost = np.asarray(model.cost, dtype=np.float64)
+    servings = _servings(max_servings, n)
+    week = _not_solved(1)
+
+    # 1. Lower bound and prices
+    with PHASE_SECONDS.time(phase='build'):
+        mip, _, servings_rows = build_week(model, big_m, [model.col_upper] * days, servings, no_consecutive)
+    if _expired(deadline):
+        return week
+    status, week["lower_bound"], duals = mip.relaxation(backend, _time_left(deadline))
+    if status != 'Optimal':
+        week["status"] = 'Infeasible' if status == 'Infeasible' else 'Not Solved'
+        return week
+    prices = cost if servings_rows is None else cost + np.maximum(-duals[servings_rows], 0)
+
+    with ThreadPoolExecutor(max_workers=max(1, workers or days)) as pool:
+        # 2. First feasible week: greedy, then with the later days reserved
+        x_costs = [cost, prices] if servings_rows is not None else [cost]
+        candidates = []
+        for lookahead in (None, big_m):
+            until = deadline
+            if lookahead is not None and deadline is not None:
+                until = time.perf_counter() + LOOKAHEAD_SHARE * _time_left(deadline)
+            starts = list(pool.map(
+                lambda x_cost: _rolling_horizon(model, x_cost, servings, no_consecutive, days, backend,
+                                                lookahead, until),
+                x_costs,
+            ))
+            week["solves"] += sum(solves for _, solves in starts)
+            candidates = [plan for plan, _ in starts if plan is not None]
+            if candidates:
+                break
+        if not candidates:
+            if _expired(deadline):
+                return week
+            fallback = _solve_monolithic(model, big_m, days, max_servings, no_consecutive, backend,
+                                         _time_left(deadline))
+            week["solves"] += fallback["solves"]
+            if fallback["lower_bound"] is not None:
+                week["lower_bound"] = max(week["lower_bound"], fallback["lower_bound"])
+            week["status"], week["values"] = fallback["status"], fallback["values"]
+            return week
+        plan = min(candidates, key=lambda p: cost @ p.sum(axis=0))
+
+        # 3. Fix-and-optimize. The fixed day between windows keeps windows
+        # solved in parallel from choosing the same food on adjacent days.
+        window = min(window, days)
+        stride = window + 1
+        unchanged = 0
+        for step in range(rounds * stride):
+            if unchanged >= stride or _expired(deadline):
+                break
+            remaining = _time_left(deadline)
+            offset = step % stride
+            windows = [
+                list(range(max(s, 0), min(s + window, days)))
+                for s in range(offset - stride, days, stride)
+                if min(s + window, days) > max(s, 0)
+            ]
+            slack = None if servings is None else servings - plan.sum(axis=0)
+            outcomes = list(pool.map(
+                lambda w: _solve_window(model, big_m, plan, w, slack, len(windows), no_consecutive, backend,
+                                        remaining),
+                windows,
+            ))
+            week["solves"] += len(windows)
+            improved = False
+            for w, values in zip(windows, outcomes):
+                if values is not None and cost @ values.sum(axis=0) < \
+                        cost @ plan[w].sum(axis=0) * (1 - IMPROVEMENT_TOLERANCE):
+                    plan[w] = values
+                    improved = True
+            unchanged = 0 if improved else unchanged + 1
+
+    week["status"] = 'Feasible'
+    week["values"] = plan
+    return week
+
+
+def _solve_day(model, x_cost, x_upper, backend, big_m=None, servings=None, later=0, no_consecutive=False,
+               time_limit=None):
+    """
+    One day's quantities, or None. With `big_m`, the day is solved
+    together with the LP relaxation of the `later` days after it, all
+    within `servings` and `no_consecutive`, so it leaves them enough.
+    """
+    mip = SparseMIP()
+    if big_m is None:
+        x, _ = add_day(mip, model, x_cost, x_upper)
+    else:
+        indicators = big_m if no_consecutive else None
+        columns = [add_day(mip, model, x_cost, x_upper, big_m=indicators)]
+        columns += [add_day(mip, model, x_cost, model.col_upper, big_m=indicators, integer=False)
+                    for _ in range(later)]
+        add_week_rows(mip, [c[0] for c in columns], [c[1] for c in columns], servings, no_consecutive)
+        x = columns[0][0]
+    result = mip.solve(backend, time_limit)
+    observe_solve(mip, result, backend, result.solve_time)
+    if result.values is None:
+        return None
+    return np.rint(result.values[x])
+
+
+def _rolling_horizon(model, x_cost, servings, no_consecutive, days, backend, lookahead=None, deadline=None):
+    """
+    A feasible week built day by day, or None: each day is priced by
+    `x_cost`, limited to the servings left and, with `no_consecutive`,
+    to foods not used the day before. With `lookahead` (the big-M of
+    serving_bounds), each day also reserves what the relaxed remaining
+    days need (see _solve_day). Gives up (None) at `deadline`.
+    Returns (week, solves).
+    """
+    remaining = np.full(model.num_vars, np.inf) if servings is None else servings.copy()
+    previous = np.zeros(model.num_vars, dtype=bool)
+    week = []
+    for d in range(days):
+        upper = np.minimum(model.col_upper, remaining)
+        if no_consecutive:
+            upper = np.where(previous, 0.0, upper)
+        if _expired(deadline):
+            return None, d
+        if lookahead is None:
+            values = _solve_day(model, x_cost, upper, backend, time_limit=_time_left(deadline))
+        else:
+            values = _solve_day(model, x_cost, upper, backend, lookahead, None if servings is None else remaining,
+                                days - d - 1, no_consecutive, _time_left(deadline))
+        if values is None:
+            return None, d + 1
+        week.append(values)
+        remaining = remaining - values
+        previous = values > 0
+    return np.array(week), days
+
+
+def _solve_window(model, big_m, plan, days, slack, shares, no_consecutive, backend, time_limit=None):
+    """
+    Re-solve `days` (consecutive) of `plan` with the other days fixed:
+    no food used by a fixed neighbour on the adjacent window day, and at
+    most the window's current servings plus its 1/shares of the slack.
+    Returns the window's new quantities, or None.
+    """
+    upper = [model.col_upper.copy() for _ in days]
+    if no_consecutive:
+        first, last = days[0], days[-1]
+        if first > 0:
+            upper[0][plan[first - 1] > 0] = 0
+        if last < len(plan) - 1:
+            upper[-1][plan[last + 1] > 0] = 0
+    servings = None
+    if slack is not None:
+        servings = plan[days].sum(axis=0) + np.floor(slack / shares)
+
+    mip, x, _ = build_week(model, big_m, upper, servings, no_consecutive)
+    result = mip.solve(backend, time_limit)
+    observe_solve(mip, result, backend, result.solve_time)
+    if result.values is None:
+        return None
+    return np.array([np.rint(result.values[x[d]]) for d in range(len(days))])
@@ -1,32 +1,53 @@
+function readForm() {
+    return {
+        min_calories:  document.getElementById('min_calories').value,
+        max_calories:  document.getElementById('max_calories').value,
+        min_protein:   document.getElementById('min_protein').value,
+        min_fiber:     document.getElementById('min_fiber').value,
+        max_sugars:    document.getElementById('max_sugars').value,
+        min_vitamin_c: document.getElementById('min_vitamin_c').value
+    };
+}
+
 document.addEventListener('DOMContentLoaded', () => {
     const form = document.getElementById('optimizationForm');
 
+    // Live preview while typing: fast approximate solve, superseded by later keystrokes
+    let previewTimer = null;
+    let previewSeq = 0;
+    form.addEventListener('input', () => {
+        clearTimeout(previewTimer);
+        previewTimer = setTimeout(async () => {
+            const seq = ++previewSeq;
+            try {
+                const response = await fetch('/api/optimize?mode=approximate', {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'application/json' },
+                    body: JSON.stringify(readForm())
+                });
+                const solution = await response.json();
+                if (seq === previewSeq && response.ok) {
+                    renderSolution(solution, { preview: true });
+                }
+            } catch (error) {
+                console.error('Preview error:', error);
+            }
+        }, 150);
+    });
+
     form.addEventListener('submit', async (e) => {
         e.preventDefault();
+        clearTimeout(previewTimer);
+        previewSeq++;
 
         // Gather form data
-        const formData = {
-            min_calories:  document.getElementById('min_calories').value,
-            max_calories:  document.getElementById('max_calories').value,
-            min_protein:   document.getElementById('min_protein').value,
-            min_fiber:     document.getElementById('min_fiber').value,
-            max_sugars:    document.getElementById('max_sugars').value,
-            min_vitamin_c: document.getElementById('min_vitamin_c').value
-        };
+        const formData = readForm();
 
         try {
-            // POST as JSON
-            const response = await fetch('/optimize', {
-                method: 'POST',
-                headers: { 'Content-Type': 'application/json' },
-                body: JSON.stringify(formData)
-            });
+            // Solve through a server-side session so small edits re-solve incrementally
+            const solution = await optimizeInSession(formData);
 
-            // We expect an HTML snippet in the response
-            const htmlSnippet = await response.text();
-
-            // Insert that HTML snippet into #result div
-            document.getElementById('result').innerHTML = htmlSnippet;
+            renderSolution(solution);
 
         } catch (error) {
             console.error('Error:', error);
@@ -34,3 +55,84 @@ document.addEventListener('DOMContentLoaded', () => {
         }
     });
 });
+
+let sessionId = null;
+
+async function optimizeInSession(formData) {
+    for (let attempt = 0; attempt < 2; attempt++) {
+        if (!sessionId) {
+            const created = await fetch('/sessions', { method: 'POST' });
+            sessionId = (await created.json()).id;
+        }
+
+        // POST as JSON, get the solution back as JSON
+        const response = await fetch(`/sessions/${sessionId}/optimize`, {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify(formData)
+        });
+
+        // Session was evicted after being idle: open a new one and retry
+        if (response.status === 404) {
+            sessionId = null;
+            continue;
+        }
+        return await response.json();
+    }
+    throw new Error('Could not open an optimization session');
+}
+
+// Previews show the SVG chart: it is drawn without Matplotlib, so typing
+// doesn't cost a PNG render per keystroke
+function renderSolution(solution, { preview = false } = {}) {
+    const result = document.getElementById('result');
+    const chartContainer = document.getElementById('chartContainer');
+    result.innerHTML = '';
+    chartContainer.innerHTML = '';
+
+    const status = document.createElement('h2');
+    status.textContent = `Solution Status: ${solution.status}`;
+    result.appendChild(status);
+
+    if (solution.status !== 'Optimal' && solution.status !== 'Feasible') {
+        const p = document.createElement('p');
+        p.textContent = 'No feasible solution found.';
+        result.appendChild(p);
+        return;
+    }
+
+    const cost = document.createElement('p');
+    cost.textContent = `Objective Value (Total Cost): ${solution.objective_value}`;
+    result.appendChild(cost);
+
+    // Approximate / early-stopped answers say how far from optimal they can be
+    if (solution.gap !== undefined && solution.gap !== null) {
+        const quality = document.createElement('p');
+        const label = solution.mode === 'approximate' ? 'Preview' : 'Mode: exact';
+        quality.textContent = `${label} (within ${(solution.gap * 100).toFixed(1)}% of optimal)`;
+        result.appendChild(quality);
+    }
+
+    const heading = document.createElement('h3');
+    heading.textContent = 'Quantities:';
+    result.appendChild(heading);
+
+    const list = document.createElement('ul');
+    for (const [food, qty] of Object.entries(solution.quantities)) {
+        const item = document.createElement('li');
+        item.textContent = `${food}: ${qty}`;
+        list.appendChild(item);
+    }
+    result.appendChild(list);
+
+    // Chart is rendered server-side on demand, only when the image is requested
+    if (solution.chart) {
+        const chartHeading = document.createElement('h3');
+        chartHeading.textContent = 'Macro Chart';
+        const img = document.createElement('img');
+        img.src = preview ? solution.chart.svg : solution.chart.png;
+        img.alt = 'Stacked Bar Chart';
+        chartContainer.appendChild(chartHeading);
+        chartContainer.appendChild(img);
+    }
+}
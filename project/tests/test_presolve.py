@@ -0,0 +1,154 @@
+import numpy as np
+import pytest
+
+from benchmarks.synthetic import FOODS_FILE, random_constraints, synthetic_catalog
+from optimization import presolve
+from optimization.catalog import FoodCatalog
+from optimization.ilp_solver import optimize_nutrition
+from optimization.model import build_model
+from optimization.presolve import column_upper_bounds, dominated_foods
+
+
+def dominates(cost, G, i, j):
+    return cost[i] <= cost[j] and np.all(G[i] >= G[j])
+
+
+def assert_sound_and_maximal(cost, G, mask):
+    """
+    Every removed food has a kept dominator (or buying nothing dominates
+    it), and no kept food dominates another kept food.
+    """
+    kept = np.flatnonzero(~mask)
+    for j in np.flatnonzero(mask):
+        nothing = cost[j] >= 0 and np.all(G[j] <= 0)
+        assert nothing or any(dominates(cost, G, i, j) for i in kept), j
+    for i in kept:
+        assert not (cost[i] >= 0 and np.all(G[i] <= 0))
+        for j in kept:
+            if i != j:
+                assert not dominates(cost, G, i, j), (i, j)
+
+
+# ---------- dominated_foods ----------
+
+def test_identical_foods_keep_exactly_one():
+    cost = np.array([2.0, 1.0, 1.0, 1.0])
+    G = np.array([[3.0, 1.0], [3.0, 1.0], [3.0, 1.0], [3.0, 1.0]])
+    mask = dominated_foods(cost, G)
+    # The three cheapest are interchangeable: the first of them is kept
+    assert mask.tolist() == [True, False, True, True]
+
+
+def test_cheaper_and_better_food_dominates():
+    cost = np.array([1.0, 2.0, 0.5])
+    G = np.array([[5.0, 2.0], [4.0, 2.0], [1.0, 3.0]])
+    mask = dominated_foods(cost, G)
+    assert mask.tolist() == [False, True, False]
+
+
+def test_buy_nothing_dominates_foods_that_do_not_help():
+    cost = np.array([1.0, 0.0, 1.0, -1.0, 1.0])
+    G = np.array([
+        [0.0, -2.0],    # only hurts
+        [0.0, 0.0],     # free but useless
+        [0.0, 1.0],     # helps one row
+        [0.0, -1.0],    # negative cost: buying it lowers the objective
+        [-1.0, 1.5],    # hurts one row, helps another
+    ])
+    mask = dominated_foods(cost, G)
+    assert mask.tolist() == [True, True, False, False, False]
+
+
+def test_random_catalog_is_sound_and_maximal():
+    rng = np.random.default_rng(3)
+    cost = rng.integers(1, 6, size=300).astype(float)
+    G = rng.integers(-3, 4, size=(300, 3)).astype(float)
+    mask = dominated_foods(cost, G)
+    assert mask.any()
+    assert_sound_and_maximal(cost, G, mask)
+
+
+def test_front_truncation_only_removes_fewer(monkeypatch):
+    cost = np.array([1.0, 1.0, 2.0, 2.0, 3.0, 3.0])
+    G = np.array([
+        [1.0, 0.0],
+        [0.0, 1.0],
+        [0.5, 0.5],
+        [0.2, 0.9],
+        [0.4, 0.4],     # dominated by food 2 only
+        [0.0, 0.8],     # dominated by food 1 (and 3)
+    ])
+    monkeypatch.setattr(presolve, 'DOMINANCE_BLOCK', 2)
+
+    full = dominated_foods(cost, G)
+    assert full.tolist() == [False, False, False, False, True, True]
+
+    # Only foods 0 and 1 fit the front: food 2 can no longer remove food 4
+    monkeypatch.setattr(presolve, 'DOMINANCE_FRONT', 2)
+    truncated = dominated_foods(cost, G)
+    assert truncated.tolist() == [False, False, False, False, False, True]
+
+
+# ---------- column_upper_bounds ----------
+
+def catalog_of(foods):
+    return FoodCatalog.from_foods_data({
+        name: {"cost": 1.0, "calories": 0.0, "protein": 0.0, "sugars": 0.0, **values}
+        for name, values in foods.items()
+    })
+
+
+def test_upper_bounds_from_max_rows():
+    catalog = catalog_of({
+        'soda': {'sugars': 20.0, 'calories': 150.0},
+        'rice': {'calories': 200.0000001},
+        'tofu': {'protein': 15.0},
+    })
+    model = build_model({'max_sugars': '50', 'max_calories': '2000', 'min_protein': '100'}, catalog)
+
+    assert column_upper_bounds(model).tolist() == [2.0, 10.0, np.inf]
+    relaxed = column_upper_bounds(model, integer=False)
+    assert relaxed[0] == pytest.approx(2.5)
+    assert relaxed[1] == pytest.approx(2000 / 200.0000001)
+    assert relaxed[2] == np.inf
+
+
+def test_min_rows_and_rows_with_negative_coefficients_give_no_bound():
+    catalog = catalog_of({
+        'a': {'sugars': 10.0, 'protein': 10.0},
+        'b': {'sugars': -5.0, 'protein': 10.0},
+    })
+    model = build_model({'max_sugars': '30', 'min_protein': '50'}, catalog)
+    assert column_upper_bounds(model).tolist() == [np.inf, np.inf]
+
+
+def test_negative_max_fixes_contributing_foods_at_zero():
+    catalog = catalog_of({'a': {'sugars': 10.0}, 'b': {'protein': 1.0}})
+    model = build_model({'max_sugars': '-5'}, catalog)
+    assert column_upper_bounds(model).tolist() == [0.0, np.inf]
+
+
+# ---------- optimum unchanged ----------
+
+def assert_same_optimum(constraints, catalog):
+    plain = optimize_nutrition(constraints, catalog, presolve=False)
+    reduced = optimize_nutrition(constraints, catalog, presolve=True)
+    assert reduced['status'] == plain['status']
+    if plain['objective_value'] is None:
+        assert reduced['objective_value'] is None
+    else:
+        assert reduced['objective_value'] == pytest.approx(plain['objective_value'], abs=1e-6)
+
+
+@pytest.mark.parametrize('constraints', random_constraints(20, seed=1) + [
+    {},
+    {'min_calories': '2000', 'max_calories': '2000'},
+    {'min_calories': '3000', 'max_calories': '1000'},
+])
+def test_presolve_keeps_optimum_on_foods_json(constraints):
+    assert_same_optimum(constraints, FoodCatalog.from_json(FOODS_FILE))
+
+
+@pytest.mark.parametrize('constraints', random_constraints(10, seed=2))
+def test_presolve_keeps_optimum_on_synthetic_catalog(constraints):
+    assert_same_optimum(constraints, synthetic_catalog(300, seed=5))